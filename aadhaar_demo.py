@@ -0,0 +1,92 @@
+import os
+
+import streamlit as st
+
+import aadhaar_qr
+import content
+
+SAMPLES = {
+    "Adult resident": ("Asha Verma", "14-02-1995", False),
+    "Minor (under 18)": ("Kabir Rao", "09-11-2010", False),
+    "Tampered date of birth": ("Ravi Kumar", "23-06-2012", True),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def _sample_payloads():
+    key = aadhaar_qr.test_key()
+    payloads = {}
+    for label, (name, dob, tampered) in SAMPLES.items():
+        fields = aadhaar_qr.sample_fields(name, dob)
+        if tampered:
+            # Signed as an adult, then the date of birth is edited afterwards.
+            signed = aadhaar_qr.make_payload(dict(fields, dob="23-06-1990"), b"", key)
+            payloads[label] = aadhaar_qr.tamper(signed, "23-06-1990", dob)
+        else:
+            payloads[label] = aadhaar_qr.make_payload(fields, b"", key)
+    return payloads
+
+
+@st.cache_resource(show_spinner=False)
+def _batch(count):
+    return aadhaar_qr.sample_batch(count)
+
+
+@st.cache_resource(show_spinner=False)
+def _pool():
+    workers = min(os.cpu_count() or 1, aadhaar_qr.MAX_WORKERS)
+    pool = aadhaar_qr.make_pool(workers)
+    # Start the workers now rather than inside the first timed batch.
+    list(pool.map(aadhaar_qr.warm_up, range(workers)))
+    return pool, workers
+
+
+@content.live_only
+@st.fragment
+def _verifier():
+    samples = _sample_payloads()
+    choice = st.selectbox("Sample QR", list(samples) + ["Paste your own"], key="aadhaar_sample")
+    if choice == "Paste your own":
+        payload = st.text_area("Secure QR payload (the decimal string in the QR code)", key="aadhaar_payload")
+        if not payload.strip():
+            return
+    else:
+        payload = samples[choice]
+        st.code(payload[:160] + "…", language=None)
+
+    result = aadhaar_qr.verify(payload)
+    cols = st.columns(3)
+    cols[0].metric("SHA-256 hash", "matches" if result.hash_matches else "mismatch")
+    cols[1].metric("RSA signature", "valid" if result.signature_valid else "invalid")
+    cols[2].metric("Age over 18", {True: "yes", False: "no", None: "unknown"}[result.age_above_18])
+    if result.error:
+        st.error(result.error)
+    elif not result.age_above_18:
+        st.warning("Under 18: nextPay would not let this user in (see the FAQs).")
+    if result.fields:
+        # Only the fields an Anon Aadhaar proof can selectively reveal.
+        st.caption(
+            " · ".join(f"{name}: {result.fields[name] or '—'}" for name in ("gender", "state", "pincode"))
+        )
+
+    with st.expander("Batch verification"):
+        count = st.select_slider("Payloads", [1_000, 5_000, 20_000], key="aadhaar_batch_size")
+        if st.button("Verify batch", key="aadhaar_batch"):
+            payloads = _batch(count)
+            pool, workers = _pool()
+            results, stats = aadhaar_qr.verify_batch(payloads, pool, workers)
+            valid = sum(ok for ok, _ in results)
+            st.write(
+                f"{stats['payloads']:,} payloads on {stats['cores']} core(s) in {stats['seconds']:.2f}s: "
+                f"**{stats['per_second']:,.0f}/s**, {stats['per_second_per_core']:,.0f}/s per core. "
+                f"{valid:,} valid, {sum(age for _, age in results if age):,} over 18."
+            )
+
+
+def panel():
+    st.subheader("🔍 Try the Secure QR Check", anchor="secure-qr-check")
+    st.write(
+        "Before a proof is generated, the Secure QR's SHA-256 hash and RSA signature are checked and "
+        "the age-over-18 flag is read from it. These samples are signed with a local test key."
+    )
+    _verifier()
@@ -0,0 +1,464 @@
+import argparse
+import base64
+import datetime
+import functools
+import hashlib
+import hmac
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+import zlib
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+# No Streamlit import here: batch workers import this module, and the page
+# panel lives in aadhaar_demo.py.
+
+# Verifying key: a PEM public key or X.509 certificate (e.g. UIDAI's offline
+# eKYC certificate). Without one, the built-in test key is used.
+PUBLIC_KEY_PATH = os.environ.get("NEXTPAY_AADHAAR_PUBLIC_KEY")
+# The committed test key pair; `python aadhaar_qr.py --write-test-key`
+# regenerates it from TEST_KEY_SEED. Searching for 2048-bit primes in pure
+# Python takes seconds, so it isn't done at runtime.
+TEST_KEY_PATH = os.path.join("fixtures", "aadhaar_test_key.json")
+TEST_KEY_SEED = "nextpay-aadhaar-test-key"
+KEY_BITS = 2048
+SIGNATURE_SIZE = KEY_BITS // 8
+DELIMITER = 255
+# The most digits a QR code can hold, and the most a payload may inflate to:
+# real Secure QRs decompress to a few KB, photo included.
+MAX_DIGITS = 7089
+MAX_PAYLOAD_BYTES = 64 * 1024
+# Limits for batch runs, which share one process pool across sessions.
+MAX_WORKERS = 4
+MAX_BATCH = 20_000
+# Python refuses to parse longer decimal strings in one go (CVE-2020-10735).
+DIGITS_PER_CHUNK = 4000
+
+# Secure QR v2 text fields, in order; the photo follows the last one.
+FIELDS = (
+    "version", "email_mobile_status", "reference_id", "name", "dob", "gender", "care_of", "district",
+    "landmark", "house", "location", "pincode", "post_office", "state", "street", "sub_district", "vtc",
+    "mobile_last_4",
+)
+# ASN.1 DigestInfo prefix for SHA-256 in a PKCS#1 v1.5 signature.
+SHA256_PREFIX = bytes.fromhex("3031300d060960864801650304020105000420")
+RSA_OID = bytes.fromhex("2a864886f70d010101")
+
+PublicKey = namedtuple("PublicKey", "n e")
+PrivateKey = namedtuple("PrivateKey", "n e d p q")
+Verification = namedtuple("Verification", "hash_matches signature_valid fields age_above_18 error")
+
+
+class QRError(ValueError):
+    pass
+
+
+# --- test key -------------------------------------------------------------
+
+
+def _probable_prime(n, rng, rounds=40):
+    if n % 2 == 0:
+        return n == 2
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for _ in range(rounds):
+        x = pow(rng.randrange(2, n - 1), d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = pow(x, 2, n)
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def _prime(bits, rng, e):
+    while True:
+        candidate = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        if candidate % e != 1 and _probable_prime(candidate, rng):
+            return candidate
+
+
+def generate_key(seed=TEST_KEY_SEED, bits=KEY_BITS):
+    rng = random.Random(seed)
+    e = 65537
+    while True:
+        p, q = _prime(bits // 2, rng, e), _prime(bits // 2, rng, e)
+        n = p * q
+        if p != q and n.bit_length() == bits:
+            return PrivateKey(n, e, pow(e, -1, (p - 1) * (q - 1)), p, q)
+
+
+def write_test_key(path=TEST_KEY_PATH):
+    key = generate_key()
+    with open(path, "w") as f:
+        json.dump({"e": key.e, "p": hex(key.p), "q": hex(key.q)}, f, indent=2)
+        f.write("\n")
+
+
+@functools.lru_cache(maxsize=None)
+def test_key(path=TEST_KEY_PATH):
+    # A throwaway RSA key for demo payloads. Never use it for anything real.
+    with open(path) as f:
+        spec = json.load(f)
+    e, p, q = spec["e"], int(spec["p"], 16), int(spec["q"], 16)
+    return PrivateKey(p * q, e, pow(e, -1, (p - 1) * (q - 1)), p, q)
+
+
+# --- DER / PEM ------------------------------------------------------------
+
+
+def _der(data, offset=0):
+    # One TLV: returns (tag, value start, value end).
+    tag, length = data[offset], data[offset + 1]
+    offset += 2
+    if length & 0x80:
+        size = length & 0x7F
+        length = int.from_bytes(data[offset:offset + size], "big")
+        offset += size
+    if offset + length > len(data):
+        raise QRError("truncated DER")
+    return tag, offset, offset + length
+
+
+def _children(data, start, end):
+    while start < end:
+        tag, value, start = _der(data, start)
+        yield tag, value, start
+
+
+def _der_length(n):
+    if n < 0x80:
+        return bytes([n])
+    raw = n.to_bytes((n.bit_length() + 7) // 8, "big")
+    return bytes([0x80 | len(raw)]) + raw
+
+
+def _tlv(tag, value):
+    return bytes([tag]) + _der_length(len(value)) + value
+
+
+def _der_int(n):
+    return _tlv(0x02, n.to_bytes(n.bit_length() // 8 + 1, "big"))
+
+
+def _spki(data, start, end):
+    # SubjectPublicKeyInfo: SEQ { SEQ { rsaEncryption, NULL }, BIT STRING { SEQ { n, e } } }
+    (_, alg, alg_end), (_, bits, bits_end) = list(_children(data, start, end))[:2]
+    if data[alg:alg_end][2:2 + len(RSA_OID)] != RSA_OID:
+        raise QRError("not an RSA public key")
+    _, seq, seq_end = _der(data, bits + 1)
+    (_, n, n_end), (_, e, e_end) = _children(data, seq, seq_end)
+    return PublicKey(int.from_bytes(data[n:n_end], "big"), int.from_bytes(data[e:e_end], "big"))
+
+
+def public_key_pem(key):
+    rsa = _tlv(0x30, _der_int(key.n) + _der_int(key.e))
+    spki = _tlv(0x30, _tlv(0x30, _tlv(0x06, RSA_OID) + b"\x05\x00") + _tlv(0x03, b"\x00" + rsa))
+    body = base64.encodebytes(spki).decode().replace("\n", "")
+    lines = [body[i:i + 64] for i in range(0, len(body), 64)]
+    return "\n".join(["-----BEGIN PUBLIC KEY-----", *lines, "-----END PUBLIC KEY-----", ""])
+
+
+@functools.lru_cache(maxsize=16)
+def load_public_key(pem):
+    # Parsed once per distinct PEM per process; verifying thousands of QRs
+    # against the same certificate never re-parses it.
+    lines = [line.strip() for line in pem.strip().splitlines()]
+    kind = lines[0].removeprefix("-----BEGIN ").removesuffix("-----")
+    der = base64.b64decode("".join(line for line in lines if not line.startswith("-----")))
+    _, start, end = _der(der)
+    if kind == "PUBLIC KEY":
+        return _spki(der, start, end)
+    if kind == "CERTIFICATE":
+        # Certificate: SEQ { tbsCertificate, ... }; the key is the child of
+        # tbsCertificate that starts with the rsaEncryption algorithm.
+        _, tbs, tbs_end = next(_children(der, start, end))
+        for tag, value, value_end in _children(der, tbs, tbs_end):
+            if tag == 0x30 and der[value] == 0x30 and RSA_OID in der[value:value + 16]:
+                return _spki(der, value, value_end)
+    raise QRError(f"unsupported key format: {kind}")
+
+
+@functools.lru_cache(maxsize=None)
+def default_public_key_pem():
+    if PUBLIC_KEY_PATH:
+        with open(PUBLIC_KEY_PATH) as f:
+            return f.read()
+    return public_key_pem(test_key())
+
+
+# --- payloads -------------------------------------------------------------
+
+
+def _decimal_to_bytes(text):
+    value = 0
+    for i in range(0, len(text), DIGITS_PER_CHUNK):
+        chunk = text[i:i + DIGITS_PER_CHUNK]
+        value = value * 10 ** len(chunk) + int(chunk)
+    return value.to_bytes((value.bit_length() + 7) // 8, "big")
+
+
+def _bytes_to_decimal(data):
+    value = int.from_bytes(data, "big")
+    digits = []
+    chunk = 10**DIGITS_PER_CHUNK
+    while value:
+        value, low = divmod(value, chunk)
+        digits.append(str(low).zfill(DIGITS_PER_CHUNK))
+    return "".join(reversed(digits)).lstrip("0") or "0"
+
+
+def sign(data, key):
+    digest = SHA256_PREFIX + hashlib.sha256(data).digest()
+    size = (key.n.bit_length() + 7) // 8
+    encoded = int.from_bytes(b"\x00\x01" + b"\xff" * (size - len(digest) - 3) + b"\x00" + digest, "big")
+    # Chinese remainder theorem: two half-size exponentiations.
+    m1 = pow(encoded, key.d % (key.p - 1), key.p)
+    m2 = pow(encoded, key.d % (key.q - 1), key.q)
+    h = pow(key.q, -1, key.p) * (m1 - m2) % key.p
+    return (m2 + h * key.q).to_bytes(size, "big")
+
+
+def make_payload(fields, photo=b"", key=None):
+    # Builds a Secure QR v2 string the way UIDAI does: 0xFF-separated fields,
+    # the photo, an RSA signature over all of it, gzip, then one decimal.
+    key = key or test_key()
+    signed = bytes([DELIMITER]).join(str(fields.get(name, "")).encode("latin-1") for name in FIELDS)
+    signed += bytes([DELIMITER]) + photo
+    return _bytes_to_decimal(zlib.compress(signed + sign(signed, key), 9))
+
+
+def sample_fields(name="Asha Verma", dob="14-02-1995", issued=None, rng=None):
+    rng = rng or random.Random(name + dob)
+    issued = issued or datetime.datetime(2024, 8, 1, 10, 30)
+    return {
+        "version": "V2",
+        "email_mobile_status": "0",
+        "reference_id": f"{rng.randrange(10_000):04d}{issued:%Y%m%d%H%M%S}{rng.randrange(1000):03d}",
+        "name": name,
+        "dob": dob,
+        "gender": rng.choice("MF"),
+        "care_of": "",
+        "district": rng.choice(["Pune", "Bengaluru Urban", "Jaipur", "Lucknow"]),
+        "landmark": "",
+        "house": str(rng.randrange(1, 400)),
+        "location": "",
+        "pincode": str(rng.randrange(110_000, 855_000)),
+        "post_office": "",
+        "state": rng.choice(["Maharashtra", "Karnataka", "Rajasthan", "Uttar Pradesh"]),
+        "street": "",
+        "sub_district": "",
+        "vtc": "",
+        "mobile_last_4": f"{rng.randrange(10_000):04d}",
+    }
+
+
+def tamper(payload, old, new):
+    # Edits the signed content after signing, as a forger would.
+    data = zlib.decompress(_decimal_to_bytes(payload)).replace(old.encode(), new.encode(), 1)
+    return _bytes_to_decimal(zlib.compress(data, 9))
+
+
+def _inflate(payload):
+    payload = payload.strip()
+    if len(payload) > MAX_DIGITS:
+        raise QRError(f"payload longer than a QR code can hold ({len(payload):,} digits)")
+    try:
+        inflater = zlib.decompressobj(zlib.MAX_WBITS | 32)
+        # Stop at the limit instead of inflating whatever a crafted payload
+        # expands to.
+        data = inflater.decompress(_decimal_to_bytes(payload), MAX_PAYLOAD_BYTES)
+    except (ValueError, zlib.error) as e:
+        raise QRError(f"not a Secure QR payload: {e}") from None
+    if inflater.unconsumed_tail:
+        raise QRError(f"payload inflates past {MAX_PAYLOAD_BYTES:,} bytes")
+    return data
+
+
+def parse(payload):
+    # Returns (fields, photo, signed bytes, signature).
+    data = _inflate(payload)
+    if len(data) <= SIGNATURE_SIZE:
+        raise QRError("payload too short")
+    signed, signature = data[:-SIGNATURE_SIZE], data[-SIGNATURE_SIZE:]
+    parts = signed.split(bytes([DELIMITER]), len(FIELDS))
+    if len(parts) <= len(FIELDS) or parts[0] != b"V2":
+        raise QRError("only Secure QR v2 payloads are supported")
+    fields = {name: value.decode("latin-1") for name, value in zip(FIELDS, parts)}
+    # Email/mobile hashes (32 bytes each, per the status bits) sit between
+    # the photo and the signature.
+    try:
+        status = int(fields["email_mobile_status"] or 0)
+    except ValueError:
+        raise QRError(f"bad email/mobile status: {fields['email_mobile_status']!r}") from None
+    hashes = 32 * bin(status & 3).count("1")
+    photo = parts[-1][:len(parts[-1]) - hashes]
+    return fields, photo, signed, signature
+
+
+def check_signature(signed, signature, key):
+    # Returns (hash_matches, signature_valid): the PKCS#1 v1.5 padding and
+    # DigestInfo recovered from the signature, and the SHA-256 inside it.
+    size = (key.n.bit_length() + 7) // 8
+    if len(signature) != size:
+        return False, False
+    encoded = pow(int.from_bytes(signature, "big"), key.e, key.n).to_bytes(size, "big")
+    digest_start = size - len(SHA256_PREFIX) - 32
+    padding_ok = (
+        encoded[:2] == b"\x00\x01"
+        and encoded[2:digest_start - 1] == b"\xff" * (digest_start - 3)
+        and encoded[digest_start - 1] == 0
+        and encoded[digest_start:size - 32] == SHA256_PREFIX
+    )
+    hash_matches = hmac.compare_digest(encoded[size - 32:], hashlib.sha256(signed).digest())
+    return hash_matches, padding_ok and hash_matches
+
+
+def age_above_18(dob, on):
+    try:
+        born = datetime.datetime.strptime(dob, "%d-%m-%Y").date()
+    except ValueError:
+        raise QRError(f"bad date of birth: {dob!r}") from None
+    return (on.year - born.year - ((on.month, on.day) < (born.month, born.day))) >= 18
+
+
+def verify(payload, pem=None, on=None):
+    key = load_public_key(pem or default_public_key_pem())
+    try:
+        fields, _, signed, signature = parse(payload)
+    except QRError as e:
+        return Verification(False, False, {}, None, str(e))
+    hash_matches, valid = check_signature(signed, signature, key)
+    if not valid:
+        return Verification(hash_matches, False, fields, None, "signature does not match")
+    try:
+        above = age_above_18(fields["dob"], on or datetime.date.today())
+    except QRError as e:
+        return Verification(hash_matches, True, fields, None, str(e))
+    return Verification(hash_matches, True, fields, above, None)
+
+
+# --- batch ----------------------------------------------------------------
+
+_worker_pem = None
+
+
+def _init_worker(pem):
+    global _worker_pem
+    _worker_pem = pem
+    load_public_key(pem)
+
+
+def _verify_chunk(payloads):
+    today = datetime.date.today()
+    out = []
+    for payload in payloads:
+        result = verify(payload, _worker_pem, today)
+        out.append((result.signature_valid, result.age_above_18))
+    return out
+
+
+def warm_up(_):
+    return os.getpid()
+
+
+def make_pool(workers, pem=None):
+    # Spawned rather than forked: the app process runs threads, and forking
+    # those is unsafe. Keep the pool around; spawning costs far more than
+    # verifying.
+    return ProcessPoolExecutor(
+        max(1, min(workers, MAX_WORKERS)),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(pem or default_public_key_pem(),),
+    )
+
+
+def verify_batch(payloads, pool, workers, chunk_size=256):
+    # Returns per-payload (signature_valid, age_above_18) and throughput.
+    if len(payloads) > MAX_BATCH:
+        raise ValueError(f"at most {MAX_BATCH:,} payloads per batch, got {len(payloads):,}")
+    workers = max(1, min(workers, MAX_WORKERS))
+    start = time.perf_counter()
+    chunks = [payloads[i:i + chunk_size] for i in range(0, len(payloads), chunk_size)]
+    results = [item for chunk in pool.map(_verify_chunk, chunks) for item in chunk]
+    elapsed = time.perf_counter() - start
+    cores = min(workers, os.cpu_count() or workers)
+    return results, {
+        "payloads": len(payloads),
+        "workers": workers,
+        "cores": cores,
+        "seconds": elapsed,
+        "per_second": len(payloads) / elapsed,
+        "per_second_per_core": len(payloads) / elapsed / cores,
+    }
+
+
+def sample_batch(count, invalid=0.05, seed=0, distinct=512):
+    # Payloads for batch runs, a share of them tampered with. Signing is far
+    # slower than verifying, so `distinct` payloads are signed and repeated;
+    # nothing caches verification results, so repeats cost the same.
+    rng = random.Random(seed)
+    key = test_key()
+    payloads = []
+    for i in range(min(count, distinct)):
+        dob = f"{rng.randrange(1, 29):02d}-{rng.randrange(1, 13):02d}-{rng.randrange(1950, 2015)}"
+        fields = sample_fields(f"Resident {i}", dob, rng=rng)
+        if rng.random() < invalid:
+            payload = tamper(make_payload(dict(fields, dob="01-01-1970"), rng.randbytes(600), key), "01-01-1970", dob)
+        else:
+            payload = make_payload(fields, rng.randbytes(600), key)
+        payloads.append(payload)
+    return [payloads[i % len(payloads)] for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verify Aadhaar Secure QR payloads.")
+    parser.add_argument("payloads", nargs="?", help="file with one payload per line (default: generated samples)")
+    parser.add_argument("--count", type=int, default=20_000, help="generated samples when no file is given")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--public-key", help="PEM public key or certificate (default: the test key)")
+    parser.add_argument("--write-test-key", action="store_true", help=f"regenerate {TEST_KEY_PATH} and exit")
+    args = parser.parse_args()
+
+    if args.write_test_key:
+        write_test_key()
+        return
+
+    if args.payloads:
+        with open(args.payloads) as f:
+            payloads = [line.strip() for line in f if line.strip()]
+    else:
+        payloads = sample_batch(args.count)
+    pem = None
+    if args.public_key:
+        with open(args.public_key) as f:
+            pem = f.read()
+    for workers in sorted({min(w, MAX_WORKERS) for w in args.workers}):
+        with make_pool(workers, pem) as pool:
+            # Warm the workers up so the timing excludes interpreter startup.
+            list(pool.map(warm_up, range(workers)))
+            results, seconds = [], 0.0
+            for i in range(0, len(payloads), MAX_BATCH):
+                chunk, stats = verify_batch(payloads[i:i + MAX_BATCH], pool, workers)
+                results += chunk
+                seconds += stats["seconds"]
+        per_second = len(payloads) / seconds
+        print(
+            f"{workers} worker(s): {len(payloads):,} payloads in {seconds:.2f}s, "
+            f"{per_second:,.0f}/s, {per_second / stats['cores']:,.0f}/s per core, "
+            f"{sum(ok for ok, _ in results):,} valid",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict, defaultdict, deque
+
+import streamlit as st
+
+import content
+import soundbox_live
+
+SPEC = "architecture.json"
+# Above this many nodes, the per-chain nodes of every chain the reader hasn't
+# expanded are folded into one node per kind.
+MAX_NODES = 40
+MAX_EXPANDED = 8
+LAYER_GAP = 100
+NODE_GAP = 170
+# Barycentre passes over the layers, alternating down and up and ending on a
+# downward pass, so each layer ends up ordered under its parents.
+SWEEPS = 5
+LAYOUT_CACHE_SIZE = 128
+WIDTH = 730
+HEIGHT = 640
+EDGE_COLOR = "#B0B3BF"
+
+# key -> positioned graph, keyed on the spec's hash, the chains and the
+# expanded set.
+_layouts = OrderedDict()
+stats = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+
+
+def _fill(item, chain, name):
+    return {k: v.format(chain=chain, name=name) if isinstance(v, str) else v for k, v in item.items()}
+
+
+def build(spec, chains):
+    # Nodes and edges mentioning {chain} are repeated for every chain.
+    nodes, edges = [], []
+    for node in spec["nodes"]:
+        if "{chain}" in node["id"]:
+            nodes += [{**_fill(node, chain, name), "chain": chain} for chain, name in chains.items()]
+        else:
+            nodes.append(dict(node))
+    for edge in spec["edges"]:
+        if "{chain}" in edge["from"] or "{chain}" in edge["to"]:
+            edges += [_fill(edge, chain, name) for chain, name in chains.items()]
+        else:
+            edges.append(dict(edge))
+    return {"nodes": nodes, "edges": edges}
+
+
+def collapse(graph, kinds, expanded=(), max_nodes=MAX_NODES):
+    # Level of detail: a graph too big to read (and to draw smoothly) keeps
+    # only the expanded chains; the rest become one node per kind, and the
+    # edges between folded nodes are merged.
+    if len(graph["nodes"]) <= max_nodes:
+        return graph
+    expanded = set(expanded)
+    folded, clusters, nodes = {}, {}, []
+    for node in graph["nodes"]:
+        chain = node.get("chain")
+        if chain is None or chain in expanded:
+            nodes.append(node)
+            continue
+        cluster = folded[node["id"]] = f"{node['kind']}:*"
+        if cluster not in clusters:
+            clusters[cluster] = {"id": cluster, "kind": node["kind"], "chains": 0}
+            nodes.append(clusters[cluster])
+        clusters[cluster]["chains"] += 1
+    for cluster in clusters.values():
+        more = " more" if expanded else ""
+        cluster["label"] = f"{kinds[cluster['kind']]['label']}\n{cluster['chains']}{more} chains"
+        cluster["title"] = f"{cluster['chains']} chains folded. Expand them above to see each one."
+
+    edges, seen = [], set()
+    for edge in graph["edges"]:
+        ends = (folded.get(edge["from"], edge["from"]), folded.get(edge["to"], edge["to"]))
+        if ends not in seen:
+            seen.add(ends)
+            edges.append({**edge, "from": ends[0], "to": ends[1]})
+    return {"nodes": nodes, "edges": edges}
+
+
+def _mean(values, default):
+    return sum(values) / len(values) if values else default
+
+
+def layout(graph):
+    # Layered drawing: every node sits one layer below its deepest parent,
+    # then each layer is reordered by the mean position of its neighbours in
+    # the layer before (the barycentre heuristic) to cut edge crossings.
+    # Returns {id: (x, y)}.
+    ids = [node["id"] for node in graph["nodes"]]
+    parents, children = defaultdict(list), defaultdict(list)
+    for edge in graph["edges"]:
+        children[edge["from"]].append(edge["to"])
+        parents[edge["to"]].append(edge["from"])
+
+    depth = dict.fromkeys(ids, 0)
+    waiting = {node: len(parents[node]) for node in ids}
+    queue = deque(node for node in ids if not waiting[node])
+    while queue:
+        node = queue.popleft()
+        for child in children[node]:
+            depth[child] = max(depth[child], depth[node] + 1)
+            waiting[child] -= 1
+            if not waiting[child]:
+                queue.append(child)
+    # Nodes on a cycle never reach zero and keep the depth they got so far.
+
+    layers = defaultdict(list)
+    for node in ids:
+        layers[depth[node]].append(node)
+    rows = [layers[d] for d in sorted(layers)]
+    x = {}
+
+    def place(row):
+        for i, node in enumerate(row):
+            x[node] = i - (len(row) - 1) / 2
+
+    for row in rows:
+        place(row)
+    for sweep in range(SWEEPS):
+        neighbours, order = (parents, rows[1:]) if sweep % 2 == 0 else (children, rows[-2::-1])
+        for row in order:
+            row.sort(key=lambda node: _mean([x[n] for n in neighbours[node]], x[node]))
+            place(row)
+    return {node: (x[node] * NODE_GAP, d * LAYER_GAP) for d, row in enumerate(rows) for node in row}
+
+
+def graph(expanded=(), chains=None, max_nodes=MAX_NODES):
+    # Positioned nodes and edges ready for agraph, computed once per spec
+    # version, chain list and expanded set.
+    chains = soundbox_live.CHAINS if chains is None else chains
+    digest, spec = content.data(SPEC)
+    key = hashlib.sha256(json.dumps([digest, chains, sorted(expanded), max_nodes]).encode()).hexdigest()
+    with _lock:
+        cached = _layouts.get(key)
+        if cached is not None:
+            _layouts.move_to_end(key)
+            stats["hits"] += 1
+            return cached
+        stats["misses"] += 1
+
+    full = build(spec, chains)
+    shown = collapse(full, spec["kinds"], expanded, max_nodes)
+    positions = layout(shown)
+    kinds = spec["kinds"]
+    result = {
+        "folded": shown is not full,
+        "nodes": [
+            {
+                "id": node["id"],
+                "label": node["label"],
+                "title": node["title"],
+                "color": kinds[node["kind"]]["color"],
+                "shape": kinds[node["kind"]]["shape"],
+                "size": 18,
+                "x": positions[node["id"]][0],
+                "y": positions[node["id"]][1],
+            }
+            for node in shown["nodes"]
+        ],
+        "edges": [{"source": e["from"], "target": e["to"], "label": e.get("label", "")} for e in shown["edges"]],
+    }
+    with _lock:
+        _layouts[key] = result
+        while len(_layouts) > LAYOUT_CACHE_SIZE:
+            _layouts.popitem(last=False)
+    return result
+
+
+@content.live_only
+@st.fragment
+def _diagram():
+    from streamlit_agraph import Config, Edge, Node, agraph
+
+    expanded = ()
+    shown = graph()
+    if shown["folded"]:
+        expanded = st.multiselect(
+            "Expand chains", list(soundbox_live.CHAINS), max_selections=MAX_EXPANDED, key="architecture_expand"
+        )
+        shown = graph(expanded)
+
+    # Positions come from the server, so the browser draws the nodes where
+    # they are instead of running a force simulation on every rerun.
+    config = Config(
+        width=WIDTH,
+        height=HEIGHT,
+        physics=False,
+        interaction={"hover": True, "dragNodes": False},
+        edges={"arrows": "to", "smooth": False, "font": {"size": 10, "align": "middle"}},
+    )
+    selected = agraph(
+        nodes=[Node(**node) for node in shown["nodes"]],
+        edges=[Edge(**edge, color=EDGE_COLOR) for edge in shown["edges"]],
+        config=config,
+    )
+    titles = {node["id"]: node["title"] for node in shown["nodes"]}
+    st.caption(titles.get(selected, "Click a component for a short description."))
+
+
+def panel():
+    st.subheader("🗺️ How It Fits Together", anchor="architecture")
+    st.write(
+        "From Anon Aadhaar KYC to the `TransferTokens` contract on each chain to the Soundbox "
+        "listening for its `Transfer` events."
+    )
+    _diagram()
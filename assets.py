@@ -0,0 +1,240 @@
+import hashlib
+import io
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from urllib.parse import urlsplit
+
+import streamlit as st
+from PIL import Image, features
+
+import metrics
+
+ASSETS_DIR = "Assets"
+CACHE_DIR = os.environ.get("NEXTPAY_ASSET_CACHE", ".asset_cache")
+MANIFEST_PATH = os.path.join(CACHE_DIR, "manifest.json")
+
+# Width buckets for the generated variants. The main column is ~730px wide,
+# so 960 covers it with some headroom and 1440 covers HiDPI screens.
+WIDTHS = (480, 960, 1440)
+DEFAULT_WIDTH = int(os.environ.get("NEXTPAY_IMAGE_WIDTH", 960))
+CACHE_LIMIT = int(os.environ.get("NEXTPAY_ASSET_CACHE_BYTES", 32 * 1024 * 1024))
+# Base URL the variants are published under (see static_server.py). When set,
+# pages reference images by URL and Streamlit never uploads the bytes. Set it
+# for any deployment behind a proxy, TLS or a CDN.
+STATIC_URL = os.environ.get("NEXTPAY_STATIC_URL")
+# With only the port set, the in-process server is reached on the same host
+# the reader used for the app.
+STATIC_PORT = os.environ.get("NEXTPAY_STATIC_PORT")
+
+# Streamlit passes JPEG/PNG bytes through untouched but re-encodes anything
+# else, so "jpeg" is what the live app serves. WebP/AVIF are for static hosting.
+FORMATS = {
+    "jpeg": {"ext": "jpg", "pil": "JPEG", "options": {"quality": 85, "optimize": True, "progressive": True}},
+    "webp": {"ext": "webp", "pil": "WEBP", "options": {"quality": 80, "method": 6}},
+}
+if features.check("avif"):
+    FORMATS["avif"] = {"ext": "avif", "pil": "AVIF", "options": {"quality": 60}}
+
+# Logical image names used by the pages, mapped to their source files.
+IMAGES = {
+    "home/logo": "home/black white Thunder logo.png",
+    "anon-aadhar/intro": "anon-aadhar/intro.png",
+    "anon-aadhar/works1": "anon-aadhar/works1.png",
+    "anon-aadhar/works2": "anon-aadhar/works2.png",
+    "anon-aadhar/install": "anon-aadhar/install.png",
+    "anon-aadhar/onchain": "anon-aadhar/onchain.png",
+    "anon-aadhar/offchain": "anon-aadhar/offchain.png",
+    "cross-blockchain/hero": "cross-blockchain/Screenshot 2024-08-09 072952.png",
+    "cross-blockchain/integration": "cross-blockchain/Screenshot 2024-08-09 073022.png",
+    "soundbox/waiting": "soundbox/Screenshot 2024-08-09 073134.png",
+    "soundbox/complete": "soundbox/Screenshot 2024-08-09 073810.png",
+}
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class ByteCache:
+    # LRU bounded by the total number of bytes held rather than by entry
+    # count. Values are anything exposing a buffer (bytes, NumPy arrays); a
+    # miss is filled by `load(key)`, which by default reads the key as a path.
+    def __init__(self, limit):
+        self.limit = limit
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, load=_read):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return data
+            self.misses += 1
+
+        data = load(key)
+        size = memoryview(data).nbytes
+
+        with self._lock:
+            if key not in self._entries and size <= self.limit:
+                self._entries[key] = data
+                self.size += size
+                while self.size > self.limit:
+                    _, evicted = self._entries.popitem(last=False)
+                    self.size -= memoryview(evicted).nbytes
+        return data
+
+
+# The variant files image_bytes() serves when no static URL is set.
+_cache = ByteCache(CACHE_LIMIT)
+
+
+def file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _bucket_widths(original_width):
+    widths = [w for w in WIDTHS if w < original_width]
+    widths.append(min(original_width, WIDTHS[-1]))
+    return sorted(set(widths))
+
+
+def _build_variants(source, digest):
+    with Image.open(source) as im:
+        im.load()
+        original_width, original_height = im.size
+        # Every bundled screenshot is fully opaque, so drop the alpha channel.
+        if im.mode != "RGB":
+            im = im.convert("RGB")
+
+        variants = {fmt: {} for fmt in FORMATS}
+        for width in _bucket_widths(original_width):
+            height = round(original_height * width / original_width)
+            resized = im if width == original_width else im.resize((width, height), Image.LANCZOS)
+            for fmt, spec in FORMATS.items():
+                name = f"{digest[:16]}-{width}.{spec['ext']}"
+                path = os.path.join(CACHE_DIR, name)
+                if not os.path.exists(path):
+                    buf = io.BytesIO()
+                    resized.save(buf, spec["pil"], **spec["options"])
+                    tmp = path + ".tmp"
+                    with open(tmp, "wb") as f:
+                        f.write(buf.getvalue())
+                    os.replace(tmp, path)
+                variants[fmt][str(width)] = name
+
+    return {
+        "width": original_width,
+        "height": original_height,
+        "variants": variants,
+    }
+
+
+def load_manifest():
+    try:
+        with open(MANIFEST_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_assets():
+    # Variants are keyed by the source's content hash, so an unchanged image is
+    # never re-encoded and an edited one gets fresh file names.
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    previous = load_manifest()
+    manifest = {}
+    for name, relative in IMAGES.items():
+        source = os.path.join(ASSETS_DIR, relative)
+        digest = file_hash(source)
+        entry = previous.get(name)
+        if entry and entry["sha256"] == digest and _variants_exist(entry) and set(entry["variants"]) == set(FORMATS):
+            manifest[name] = entry
+            continue
+        manifest[name] = {"sha256": digest, "source": source, **_build_variants(source, digest)}
+
+    if manifest != previous:
+        tmp = MANIFEST_PATH + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, MANIFEST_PATH)
+    return manifest
+
+
+def _variants_exist(entry):
+    return all(
+        os.path.exists(os.path.join(CACHE_DIR, file))
+        for widths in entry["variants"].values()
+        for file in widths.values()
+    )
+
+
+@st.cache_resource(show_spinner=False)
+def get_manifest():
+    return build_assets()
+
+
+def variant_path(name, width=DEFAULT_WIDTH, fmt="jpeg"):
+    variants = get_manifest()[name]["variants"][fmt]
+    widths = sorted(int(w) for w in variants)
+    chosen = next((w for w in widths if w >= width), widths[-1])
+    return os.path.join(CACHE_DIR, variants[str(chosen)])
+
+
+def image_bytes(name, width=DEFAULT_WIDTH, fmt="jpeg"):
+    return _cache.get(variant_path(name, width, fmt))
+
+
+def static_base():
+    if STATIC_URL:
+        return STATIC_URL.rstrip("/")
+    if not STATIC_PORT:
+        return None
+    url = urlsplit(st.context.url or "")
+    # The static server speaks plain HTTP, so an HTTPS page can't load from
+    # it; those deployments need NEXTPAY_STATIC_URL.
+    if url.scheme != "http" or not url.hostname:
+        return None
+    host = f"[{url.hostname}]" if ":" in url.hostname else url.hostname
+    return f"http://{host}:{STATIC_PORT}"
+
+
+def static_url(name, width=DEFAULT_WIDTH, base=None):
+    return f"{base or static_base()}/{os.path.basename(variant_path(name, width))}"
+
+
+def image(name, caption=None, stretch=False, width=DEFAULT_WIDTH):
+    base = static_base()
+    if base:
+        data = static_url(name, width, base)
+    else:
+        data = image_bytes(name, width)
+        metrics.inc("nextpay_media_bytes_total", len(data), image=name)
+    st.image(
+        data,
+        caption=caption,
+        width="stretch" if stretch else "content",
+    )
+
+
+if __name__ == "__main__":
+    # Build step: `python assets.py` pre-generates the variants and manifest so
+    # the first visitor after a deploy doesn't pay for the encoding.
+    manifest = build_assets()
+    for name, entry in manifest.items():
+        print(f"{name}: {entry['sha256'][:16]} {sorted(entry['variants'])}", file=sys.stderr)
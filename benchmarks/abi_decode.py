@@ -0,0 +1,157 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import transfer_abi  # noqa: E402
+import transfer_indexer  # noqa: E402
+
+NAMES = ["Asha", "Ravi", "Chai Stall", "Kirana Store", "Meera", "Arjun", "Book Depot", "Priya"]
+CHAINS = ["ETH", "BSC", "PLG", "AVAX"]
+
+
+def make_logs(count, malformed, seed):
+    # Realistic eth_getLogs entries, with a share of broken ones mixed in:
+    # truncated payloads, foreign event topics and out-of-range offsets.
+    rng = random.Random(seed)
+    logs = []
+    for i in range(count):
+        sender, recipient = ("0x" + rng.randbytes(20).hex() for _ in range(2))
+        amount = rng.randint(10**15, 10**21) if rng.random() < 0.9 else rng.randint(0, 2**256 - 1)
+        topics, data = transfer_abi.encode_log(sender, recipient, amount, rng.choice(NAMES), rng.choice(CHAINS))
+        if rng.random() < malformed:
+            kind = rng.randrange(3)
+            if kind == 0:
+                data = data[: 2 + 2 * rng.randrange(len(data) // 2 - 1)]
+            elif kind == 1:
+                topics = ["0x" + rng.randbytes(32).hex()] + topics[1:]
+            else:
+                data = data[:66] + "f" * 64 + data[130:]
+        logs.append({
+            "topics": topics,
+            "data": data,
+            "blockNumber": hex(1_000_000 + i // 20),
+            "logIndex": hex(i % 20),
+            "transactionHash": "0x" + rng.randbytes(32).hex(),
+        })
+    return logs
+
+
+def naive(logs):
+    # Per-log decoding straight from the JSON-RPC hex strings.
+    out = []
+    for log in logs:
+        try:
+            out.append(transfer_abi.decode_log(log["topics"], log["data"]))
+        except transfer_abi.DecodeError:
+            out.append(None)
+    return out
+
+
+def naive_rows(chain, logs, times):
+    # What the indexer did before batching: decode_log() per log, then a
+    # history row from each Transfer.
+    out = []
+    for log in logs:
+        try:
+            transfer = transfer_abi.decode_log(log["topics"], log["data"])
+        except transfer_abi.DecodeError:
+            continue
+        out.append((
+            times[log["blockNumber"]],
+            chain,
+            int(log["blockNumber"], 16),
+            int(log["logIndex"], 16),
+            log["transactionHash"],
+            transfer.sender,
+            transfer.recipient,
+            str(transfer.amount),
+            transfer.name,
+            transfer.blockchain,
+        ))
+    return out
+
+
+def naive_buffers(topics, data, offsets):
+    # Per-log decoding of the same packed buffers the batch decoder reads.
+    view = memoryview(data)
+    offsets = offsets.tolist()
+    out = []
+    for i in range(len(offsets) - 1):
+        try:
+            out.append(transfer_abi.decode_raw(
+                [topics[96 * i + 32 * k:96 * i + 32 * k + 32] for k in range(3)], view[offsets[i]:offsets[i + 1]]
+            ))
+        except transfer_abi.DecodeError:
+            out.append(None)
+    return out
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the batch Transfer decoder with per-log decoding.")
+    parser.add_argument("--logs", type=int, default=100_000)
+    parser.add_argument("--malformed", type=float, default=0.01, help="fraction of broken logs")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    logs = make_logs(args.logs, args.malformed, args.seed)
+    packed, pack_s = timed(lambda: transfer_abi.pack_logs(logs), args.runs)
+    expected, naive_hex_s = timed(lambda: naive(logs), args.runs)
+    scalar, naive_s = timed(lambda: naive_buffers(*packed), args.runs)
+    batch, decode_s = timed(lambda: transfer_abi.decode_buffers(*packed), args.runs)
+    rows, rows_s = timed(batch.transfers, args.runs)
+    times = {log["blockNumber"]: 1_700_000_000 for log in logs}
+    expected_rows, naive_rows_s = timed(lambda: naive_rows("ETH", logs, times), args.runs)
+    indexer_rows, indexer_rows_s = timed(lambda: transfer_indexer.decoded_rows("ETH", logs, times), args.runs)
+    for name, result in (("per-log buffer", scalar), ("batch", rows)):
+        if result != expected:
+            mismatches = [i for i, (a, b) in enumerate(zip(result, expected)) if a != b]
+            raise SystemExit(f"{name} decoder disagrees with decode_log at rows {mismatches[:10]}")
+    if indexer_rows != expected_rows:
+        raise SystemExit("indexer rows disagree with per-log decoding")
+
+    # "columnar" stops at the arrays; "rows" includes building Transfer tuples;
+    # "end_to_end" adds packing the hex strings; "indexer" is the whole
+    # eth_getLogs page -> history rows step.
+    results = {
+        "logs": args.logs,
+        "invalid": expected.count(None),
+        "scalar_fallbacks": len(batch.fallback),
+        "naive_hex_s": naive_hex_s,
+        "pack_s": pack_s,
+        "naive_buffers_s": naive_s,
+        "columnar_s": decode_s,
+        "rows_s": decode_s + rows_s,
+        "speedup_columnar": naive_s / decode_s,
+        "speedup_rows": naive_s / (decode_s + rows_s),
+        "speedup_end_to_end": naive_hex_s / (pack_s + decode_s + rows_s),
+        "naive_indexer_s": naive_rows_s,
+        "indexer_s": indexer_rows_s,
+        "speedup_indexer": naive_rows_s / indexer_rows_s,
+    }
+    for key, value in results.items():
+        print(f"{key:>18}: {value:,.4f}" if isinstance(value, float) else f"{key:>18}: {value:,}")
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
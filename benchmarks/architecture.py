@@ -0,0 +1,63 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import architecture  # noqa: E402
+
+
+def timed(fn, runs):
+    times = []
+    for _ in range(runs):
+        architecture._layouts.clear()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, statistics.median(times) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time architecture graph layouts as the number of chains grows.")
+    parser.add_argument("--chains", type=int, nargs="+", default=[4, 50, 200, 500])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = []
+    for count in args.chains:
+        chains = {f"C{i}": f"Chain {i}" for i in range(count)}
+        full, full_ms = timed(lambda: architecture.graph(chains=chains, max_nodes=float("inf")), args.runs)
+        shown, shown_ms = timed(lambda: architecture.graph(chains=chains), args.runs)
+        start = time.perf_counter()
+        for _ in range(1000):
+            architecture.graph(chains=chains)
+        results.append({
+            "chains": count,
+            "full_nodes": len(full["nodes"]),
+            "full_layout_ms": full_ms,
+            "full_payload_bytes": len(json.dumps(full)),
+            "shown_nodes": len(shown["nodes"]),
+            "shown_layout_ms": shown_ms,
+            "shown_payload_bytes": len(json.dumps(shown)),
+            "cached_us": (time.perf_counter() - start) * 1000,
+        })
+        r = results[-1]
+        print(
+            f"{count:>4} chains: all {r['full_nodes']:>5} nodes {r['full_layout_ms']:7.2f} ms "
+            f"{r['full_payload_bytes'] / 1024:7.1f} KiB | shown {r['shown_nodes']:>3} nodes "
+            f"{r['shown_layout_ms']:6.2f} ms {r['shown_payload_bytes'] / 1024:5.1f} KiB | cached {r['cached_us']:.1f} us",
+            file=sys.stderr,
+        )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import soundbox_live  # noqa: E402
+import transfer_abi  # noqa: E402
+
+# A stand-in JSON-RPC node per chain, served under /<CHAIN>. Every block's logs
+# are derived from (chain, block), so repeated or overlapping queries agree.
+BLOCK_TIME = {"ETH": 12, "BSC": 3, "PLG": 2, "AVAX": 2}
+CONTRACT = "0x" + hashlib.sha256(b"nextpay-transfer-tokens").hexdigest()[:40]
+# Like most providers, refuse eth_getLogs queries that match too many logs.
+MAX_RESULTS = 10_000
+TOO_MANY = -32005
+
+
+class Chain:
+    def __init__(self, name, blocks, logs_per_block):
+        self.name = name
+        self.block_time = BLOCK_TIME[name]
+        self.logs_per_block = logs_per_block
+        self.genesis_head = blocks
+        self.started = time.time()
+        # A few addresses receive most of the traffic, as merchants would.
+        self.weights = [1 / (i + 1) for i in range(len(soundbox_live.DEMO_ADDRESSES))]
+
+    def head(self):
+        return self.genesis_head + int((time.time() - self.started) / self.block_time)
+
+    def timestamp(self, block):
+        return int(self.started - (self.genesis_head - block) * self.block_time)
+
+    def logs(self, block):
+        rng = random.Random(f"{self.name}:{block}")
+        count = min(int(rng.expovariate(1 / self.logs_per_block)), 4 * int(self.logs_per_block) + 1)
+        block_hash = "0x" + hashlib.sha256(f"{self.name}:{block}".encode()).hexdigest()
+        logs = []
+        for i in range(count):
+            sender, recipient = rng.choices(soundbox_live.DEMO_ADDRESSES, self.weights, k=2)
+            topics, data = transfer_abi.encode_log(
+                sender, recipient, rng.randint(10**15, 5 * 10**18), rng.choice(soundbox_live.NAMES), self.name
+            )
+            logs.append({
+                "address": CONTRACT,
+                "topics": topics,
+                "data": data,
+                "blockNumber": hex(block),
+                "blockHash": block_hash,
+                "blockTimestamp": hex(self.timestamp(block)),
+                "transactionHash": "0x" + hashlib.sha256(f"{self.name}:{block}:{i}".encode()).hexdigest(),
+                "transactionIndex": hex(i),
+                "logIndex": hex(i),
+                "removed": False,
+            })
+        return logs
+
+    def get_logs(self, query):
+        head = self.head()
+        start = int(query.get("fromBlock", "0x0"), 16)
+        end = head if query.get("toBlock", "latest") == "latest" else int(query["toBlock"], 16)
+        end = min(end, head)
+        logs = []
+        for block in range(start, end + 1):
+            logs += self.logs(block)
+            if len(logs) > MAX_RESULTS:
+                raise RpcFault(TOO_MANY, f"query returned more than {MAX_RESULTS} results")
+        return logs
+
+    def get_block(self, number):
+        block = int(number, 16)
+        if block > self.head():
+            return None
+        return {"number": number, "timestamp": hex(self.timestamp(block))}
+
+
+class RpcFault(Exception):
+    def __init__(self, code, message):
+        super().__init__(message)
+        self.code = code
+
+
+class Handler(BaseHTTPRequestHandler):
+    chains = {}
+
+    def _dispatch(self, chain, request):
+        method, params = request.get("method"), request.get("params", [])
+        try:
+            if method == "eth_chainId":
+                result = hex(list(soundbox_live.CHAINS).index(chain.name) + 1)
+            elif method == "eth_blockNumber":
+                result = hex(chain.head())
+            elif method == "eth_getLogs":
+                result = chain.get_logs(params[0])
+            elif method == "eth_getBlockByNumber":
+                result = chain.get_block(params[0])
+            else:
+                raise RpcFault(-32601, f"method {method} not found")
+        except RpcFault as e:
+            return {"jsonrpc": "2.0", "id": request.get("id"), "error": {"code": e.code, "message": str(e)}}
+        return {"jsonrpc": "2.0", "id": request.get("id"), "result": result}
+
+    def do_POST(self):
+        chain = self.chains.get(self.path.strip("/").upper())
+        if chain is None:
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if isinstance(request, list):
+            response = [self._dispatch(chain, item) for item in request]
+        else:
+            response = self._dispatch(chain, request)
+        body = json.dumps(response).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve deterministic TransferTokens logs over JSON-RPC.")
+    parser.add_argument("--port", type=int, default=8545)
+    parser.add_argument("--blocks", type=int, default=50_000, help="chain height at startup")
+    parser.add_argument("--logs-per-block", type=float, default=2.0)
+    parser.add_argument("--config", help="also write an indexer config pointing at this server")
+    args = parser.parse_args()
+
+    Handler.chains = {name: Chain(name, args.blocks, args.logs_per_block) for name in soundbox_live.CHAINS}
+    if args.config:
+        with open(args.config, "w") as f:
+            json.dump(
+                {
+                    name: {"url": f"http://127.0.0.1:{args.port}/{name}", "address": CONTRACT, "start_block": 0}
+                    for name in Handler.chains
+                },
+                f,
+                indent=2,
+            )
+    print(f"serving {', '.join(Handler.chains)} on :{args.port}, contract {CONTRACT}", file=sys.stderr)
+    ThreadingHTTPServer(("127.0.0.1", args.port), Handler).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# A stand-in TTS engine for benchmarks/soundbox_audio.py: same interface as
+# `espeak-ng --stdout TEXT`, with a fixed 50 ms start-up plus 30 ms per word,
+# roughly what an offline engine costs on a small device. The audio is
+# silence of a plausible length. Usage:
+#     python benchmarks/soundbox_audio.py --tts benchmarks/fake_tts.py
+import io
+import sys
+import time
+import wave
+
+SAMPLE_RATE = 16_000
+STARTUP = 0.05
+PER_WORD = 0.03
+SPOKEN_PER_WORD = 0.35  # seconds of speech per word
+
+
+def main():
+    if len(sys.argv) != 3 or sys.argv[1] != "--stdout":
+        raise SystemExit("usage: fake_tts.py --stdout TEXT")
+    words = len(sys.argv[2].split())
+    time.sleep(STARTUP + PER_WORD * words)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(SAMPLE_RATE)
+        wav.writeframes(bytes(2 * int(SAMPLE_RATE * SPOKEN_PER_WORD * max(words, 1))))
+    sys.stdout.buffer.write(out.getvalue())
+
+
+if __name__ == "__main__":
+    main()
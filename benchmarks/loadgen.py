@@ -0,0 +1,203 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import docs  # noqa: E402
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+def rss_kb(pid):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+def start_server(port):
+    proc = subprocess.Popen(
+        [
+            sys.executable, "-m", "streamlit", "run", "docs.py",
+            "--server.headless", "true",
+            "--server.port", str(port),
+            "--browser.gatherUsageStats", "false",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return proc
+        except OSError:
+            time.sleep(0.25)
+    proc.kill()
+    raise SystemExit("streamlit did not become healthy within 60s")
+
+
+async def fetch(host, port, path):
+    # Bare HTTP/1.1 GET; returns the body size.
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode())
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    _, _, body = data.partition(b"\r\n\r\n")
+    return len(body)
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = []
+        self.by_page = {}
+        self.errors = 0
+        self.media_bytes = 0
+        self.media_requests = 0
+        self.connected = 0
+
+
+async def session(host, port, stats, stop_at, think_time, pages):
+    # One simulated browser tab: connect, load the default page, then keep
+    # clicking through the sidebar with exponential think times.
+    media_seen = set()
+    try:
+        async with websockets.connect(
+            f"ws://{host}:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None
+        ) as ws:
+            stats.connected += 1
+            page = ""
+            while time.time() < stop_at:
+                msg = BackMsg()
+                msg.rerun_script.page_name = page
+                start = time.perf_counter()
+                await ws.send(msg.SerializeToString())
+
+                media = []
+                while True:
+                    forward = ForwardMsg()
+                    forward.ParseFromString(await ws.recv())
+                    kind = forward.WhichOneof("type")
+                    if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                        element = forward.delta.new_element
+                        if element.WhichOneof("type") == "imgs":
+                            media.extend(img.url for img in element.imgs.imgs)
+                    elif kind == "script_finished":
+                        break
+
+                elapsed = (time.perf_counter() - start) * 1000
+                stats.latencies.append(elapsed)
+                stats.by_page.setdefault(page or "home", []).append(elapsed)
+                if forward.script_finished != 0:
+                    stats.errors += 1
+
+                # Like a browser, fetch each media URL once per tab.
+                for url in media:
+                    if url not in media_seen and url.startswith("/"):
+                        media_seen.add(url)
+                        stats.media_bytes += await fetch(host, port, url)
+                        stats.media_requests += 1
+
+                await asyncio.sleep(random.expovariate(1 / think_time))
+                page = random.choice(pages)
+    except (OSError, websockets.WebSocketException):
+        stats.errors += 1
+    finally:
+        stats.connected -= 1
+
+
+async def run(args, server_pid):
+    stats = Stats()
+    pages = [url_path for _, _, url_path in docs.PAGES.values()]
+    stop_at = time.time() + args.ramp_up + args.duration
+    tasks = []
+    peak_rss = 0
+    for _ in range(args.sessions):
+        tasks.append(asyncio.create_task(session(args.host, args.port, stats, stop_at, args.think_time, pages)))
+        await asyncio.sleep(args.ramp_up / args.sessions)
+
+    started = time.time()
+    while any(not t.done() for t in tasks):
+        if server_pid:
+            peak_rss = max(peak_rss, rss_kb(server_pid))
+        await asyncio.sleep(0.5)
+    return stats, time.time() - started + args.ramp_up, peak_rss
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate concurrent viewers of the docs app.")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=60, help="seconds of steady load after ramp-up")
+    parser.add_argument("--ramp-up", type=float, default=10, help="seconds over which sessions connect")
+    parser.add_argument("--think-time", type=float, default=5, help="mean seconds between page changes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8599)
+    parser.add_argument("--external", action="store_true", help="target an already running server")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="loadgen.json")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    server = None if args.external else start_server(args.port)
+    idle_rss = rss_kb(server.pid) if server else 0
+    try:
+        stats, elapsed, peak_rss = asyncio.run(run(args, server.pid if server else None))
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "sessions": args.sessions,
+        "duration_s": elapsed,
+        "reruns": len(stats.latencies),
+        "throughput_rps": len(stats.latencies) / elapsed,
+        "latency_ms": {
+            "p50": percentile(stats.latencies, 50),
+            "p95": percentile(stats.latencies, 95),
+            "p99": percentile(stats.latencies, 99),
+            "mean": statistics.fmean(stats.latencies) if stats.latencies else None,
+        },
+        "latency_p95_by_page_ms": {page: percentile(v, 95) for page, v in stats.by_page.items()},
+        "errors": stats.errors,
+        "media_requests": stats.media_requests,
+        "media_bytes": stats.media_bytes,
+        "server_rss_kb": {"idle": idle_rss, "peak": peak_rss},
+        "rss_per_session_kb": (peak_rss - idle_rss) / args.sessions if server else None,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    latency = report["latency_ms"]
+    print(
+        f"{args.sessions} sessions: {report['throughput_rps']:.1f} reruns/s, "
+        f"p50 {latency['p50']:.0f} ms, p95 {latency['p95']:.0f} ms, p99 {latency['p99']:.0f} ms, "
+        f"{stats.errors} errors, {stats.media_bytes / (1 << 20):.1f} MiB media",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import nullifiers  # noqa: E402
+
+
+def single(registry, keys):
+    # Per-call latencies in microseconds.
+    times = []
+    for key in keys:
+        start = time.perf_counter()
+        registry.contains(key)
+        times.append((time.perf_counter() - start) * 1e6)
+    times.sort()
+    return {"p50_us": statistics.median(times), "p99_us": times[int(len(times) * 0.99)]}
+
+
+def batched(registry, records):
+    start = time.perf_counter()
+    registry.contains_many(records)
+    return (time.perf_counter() - start) * 1e6 / len(records)
+
+
+def set_bytes_per_million(count):
+    # The obvious alternative: a Python set of bytes objects.
+    keys = [r.tobytes() for r in nullifiers.random_records(count, seed=99)]
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    spent = set(keys)
+    used = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    # The bytes objects themselves are counted too; the list already held them.
+    used += sum(sys.getsizeof(k) for k in keys)
+    del spent
+    return used / count * 1e6
+
+
+def measure(count, lookups):
+    records = nullifiers.random_records(count)
+    start = time.perf_counter()
+    registry = nullifiers.NullifierRegistry.bulk_load(records)
+    load = time.perf_counter() - start
+
+    hits = [r.tobytes() for r in records[np.random.default_rng(1).integers(0, count, lookups)]]
+    misses = nullifiers.random_records(lookups, seed=2)
+    result = {
+        "entries": count,
+        "bulk_load_s": load,
+        "memory_mib_per_million": sum(registry.memory().values()) / count * 1e6 / 2**20,
+        "hit": single(registry, hits),
+        "miss": single(registry, [r.tobytes() for r in misses]),
+        "batched_miss_us": batched(registry, nullifiers.random_records(100_000, seed=3)),
+        "batched_hit_us": batched(registry, records[: 100_000]),
+    }
+    registry.contains_many(misses)
+    stats = registry.stats
+    # Every lookup except the known hits was for an absent nullifier.
+    absent = stats["lookups"] - len(hits) - min(count, 100_000)
+    result["bloom_false_positive_rate"] = stats["false_positives"] / absent if absent else 0.0
+
+    # Inserts, including the compactions they trigger.
+    fresh = [r.tobytes() for r in nullifiers.random_records(2 * nullifiers.COMPACT_EVERY, seed=4)]
+    start = time.perf_counter()
+    for key in fresh:
+        registry.add(key)
+    result["insert_us"] = (time.perf_counter() - start) * 1e6 / len(fresh)
+    result["compactions"] = registry.stats["compactions"]
+
+    # On disk: records are mapped, only prefixes and the filter stay resident.
+    with tempfile.TemporaryDirectory() as path:
+        nullifiers.NullifierRegistry.bulk_load(records, path=path)
+        mapped = nullifiers.NullifierRegistry.open(path)
+        memory = mapped.memory()
+        result["mapped_memory_mib_per_million"] = (sum(memory.values()) - memory["records_on_disk"]) / count * 1e6 / 2**20
+        result["mapped_hit"] = single(mapped, hits)
+        result["mapped_miss"] = single(mapped, [r.tobytes() for r in misses])
+        del mapped
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time nullifier registry lookups and measure its memory.")
+    parser.add_argument("--entries", type=int, nargs="+", default=[1_000_000, 4_000_000])
+    parser.add_argument("--lookups", type=int, default=20_000)
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    results = [measure(count, args.lookups) for count in args.entries]
+    for r in results:
+        print(
+            f"{r['entries']:>10,} entries: bulk load {r['bulk_load_s']:.2f}s, "
+            f"{r['memory_mib_per_million']:.1f} MiB/M in memory, {r['mapped_memory_mib_per_million']:.1f} MiB/M mapped\n"
+            f"    single lookup p50/p99: hit {r['hit']['p50_us']:.1f}/{r['hit']['p99_us']:.1f} us, "
+            f"miss {r['miss']['p50_us']:.1f}/{r['miss']['p99_us']:.1f} us "
+            f"(mapped: hit {r['mapped_hit']['p50_us']:.1f}, miss {r['mapped_miss']['p50_us']:.1f} us)\n"
+            f"    batched: {r['batched_hit_us']:.2f} us/hit, {r['batched_miss_us']:.2f} us/miss; "
+            f"insert {r['insert_us']:.1f} us ({r['compactions']} compactions); "
+            f"Bloom false positives {r['bloom_false_positive_rate']:.2%}",
+            file=sys.stderr,
+        )
+    print(f"Python set of bytes: {set_bytes_per_million(1_000_000) / 2**20:.1f} MiB/M", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "budgets.json")
+
+# Headroom applied by --write-budgets on top of the measured values.
+LATENCY_HEADROOM = 2.0
+# A cold run includes imports and cache warm-up, so it varies more.
+COLD_HEADROOM = 1.5
+PAYLOAD_HEADROOM = 1.1
+
+
+def page_script(root, label):
+    # Runs inside AppTest as its own script file, so it has to import
+    # everything it needs itself.
+    import sys
+
+    sys.path.insert(0, root)
+    import docs
+
+    docs.load_page(label)()
+
+
+def count_elements(node):
+    children = getattr(node, "children", None)
+    if children is None:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def count_media_bytes(totals):
+    # AppTest tears its media storage down after each run, so tally what is
+    # stored as it happens instead.
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+
+    original = MemoryMediaFileStorage.load_and_get_id
+
+    def load_and_get_id(self, path_or_data, *args, **kwargs):
+        if isinstance(path_or_data, bytes):
+            totals["media_bytes"] += len(path_or_data)
+        else:
+            totals["media_bytes"] += os.path.getsize(path_or_data)
+        return original(self, path_or_data, *args, **kwargs)
+
+    MemoryMediaFileStorage.load_and_get_id = load_and_get_id
+
+
+def run_worker(label, iterations):
+    from streamlit.testing.v1 import AppTest
+
+    os.chdir(ROOT)
+    timings = []
+    totals = {"media_bytes": 0}
+    count_media_bytes(totals)
+    elements = payload = 0
+    for _ in range(iterations):
+        totals["media_bytes"] = 0
+        at = AppTest.from_function(page_script, args=(ROOT, label), default_timeout=120)
+        start = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - start) * 1000)
+        if at.exception:
+            raise SystemExit(f"{label}: {at.exception[0].value}")
+        elements = count_elements(at._tree)
+        payload = totals["media_bytes"]
+
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS.
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = maxrss / (1 << 20) if sys.platform == "darwin" else maxrss / 1024
+    warm = timings[1:] or timings
+    print(json.dumps({
+        "iterations": iterations,
+        "cold_ms": timings[0],
+        "p50_ms": statistics.median(warm),
+        "p95_ms": sorted(warm)[max(0, round(len(warm) * 0.95) - 1)],
+        "max_ms": max(warm),
+        "peak_rss_mb": rss_mb,
+        "elements": elements,
+        "media_bytes": payload,
+    }))
+
+
+def measure(labels, iterations):
+    # One fresh interpreter per page, so peak RSS and the cold run belong to
+    # that page alone.
+    results = {}
+    for label in labels:
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", label, "--iterations", str(iterations)],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if proc.returncode:
+            raise SystemExit(proc.stderr.strip().splitlines()[-1])
+        results[label] = json.loads(proc.stdout.strip().splitlines()[-1])
+        r = results[label]
+        print(
+            f"{label:<28} p50 {r['p50_ms']:7.1f} ms  cold {r['cold_ms']:7.1f} ms  "
+            f"rss {r['peak_rss_mb']:6.1f} MB  {r['elements']:3d} elements  {r['media_bytes'] / 1024:8.1f} KiB media",
+            file=sys.stderr,
+        )
+    return results
+
+
+def compare(results, budgets):
+    failures = []
+    for label, result in results.items():
+        budget = budgets.get(label)
+        if budget is None:
+            failures.append(f"{label}: no budget recorded")
+            continue
+        for key, limit in budget.items():
+            if result[key] > limit:
+                failures.append(f"{label}: {key} {result[key]:.1f} > budget {limit:.1f}")
+    return failures
+
+
+def budgets_from(results):
+    return {
+        label: {
+            "cold_ms": round(r["cold_ms"] * COLD_HEADROOM, 1),
+            "p50_ms": round(r["p50_ms"] * LATENCY_HEADROOM, 1),
+            "media_bytes": int(r["media_bytes"] * PAYLOAD_HEADROOM),
+            "elements": r["elements"],
+        }
+        for label, r in results.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark each docs page with Streamlit's AppTest.")
+    parser.add_argument("--iterations", type=int, default=10, help="runs per page (the first is reported as cold)")
+    parser.add_argument("--page", action="append", help="only benchmark this page (repeatable)")
+    parser.add_argument("--out", default="bench_pages.json", help="where to write the JSON results")
+    parser.add_argument("--compare", nargs="?", const=BUDGETS, help="fail if any page exceeds its budget")
+    parser.add_argument("--write-budgets", nargs="?", const=BUDGETS, help="record budgets from this run")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker, args.iterations)
+        return
+
+    sys.path.insert(0, ROOT)
+    import docs
+
+    results = measure(args.page or list(docs.PAGES), args.iterations)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+
+    if args.write_budgets:
+        with open(args.write_budgets, "w") as f:
+            json.dump(budgets_from(results), f, indent=2)
+            f.write("\n")
+
+    if args.compare:
+        with open(args.compare) as f:
+            failures = compare(results, json.load(f))
+        for failure in failures:
+            print(failure, file=sys.stderr)
+        if failures:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import fee_routes  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time fee quotes for batches of amounts over every route.")
+    parser.add_argument("--amounts", type=int, nargs="+", default=[1, 100, 1_000, 10_000])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    engine = fee_routes.RouteEngine()
+    snapshot = engine.snapshot()
+    # Every (from, to) pair, direct or relayed through any chain.
+    routes = len(snapshot.chains) ** 2 * (len(snapshot.chains) + 1)
+    results = []
+    for count in args.amounts:
+        rng = np.random.default_rng(count)
+        cold, warm = [], []
+        for _ in range(args.runs):
+            # Fresh amounts each run so that "cold" never hits the memo.
+            amounts = rng.uniform(1, 100_000, count)
+            start = time.perf_counter()
+            engine.quote(amounts)
+            cold.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            engine.quote(amounts)
+            warm.append(time.perf_counter() - start)
+        results.append({
+            "amounts": count,
+            "combinations": count * routes,
+            "cold_ms": statistics.median(cold) * 1000,
+            "memo_ms": statistics.median(warm) * 1000,
+        })
+        row = results[-1]
+        print(
+            f"{count:>7,} amounts x {routes} routes: {row['cold_ms']:8.3f} ms cold, {row['memo_ms']:.3f} ms memoised",
+            file=sys.stderr,
+        )
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+
+import soundbox_audio  # noqa: E402
+import soundbox_live  # noqa: E402
+
+
+def alerts(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        (rng.randint(10**15, 5 * 10**18), rng.choice(soundbox_live.NAMES), rng.choice(list(soundbox_live.CHAINS)))
+        for _ in range(count)
+    ]
+
+
+def time_to_audio(fn, alerts):
+    # Milliseconds from the event to a complete WAV in hand.
+    times = []
+    for alert in alerts:
+        start = time.perf_counter()
+        fn(*alert)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {"p50_ms": statistics.median(times), "p99_ms": times[int(len(times) * 0.99)], "max_ms": times[-1]}
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare time-to-first-audio of cached segments and per-alert synthesis."
+    )
+    parser.add_argument("--alerts", type=int, default=200)
+    parser.add_argument(
+        "--tts",
+        default=soundbox_audio.TTS_COMMAND,
+        help="TTS command writing a WAV to stdout (benchmarks/fake_tts.py is a stand-in)",
+    )
+    parser.add_argument("--out", help="write the results as JSON")
+    args = parser.parse_args()
+
+    sample = alerts(args.alerts)
+    announcer = soundbox_audio.Announcer(tts=args.tts)
+    start = time.perf_counter()
+    announcer.warm()
+    warm_ms = (time.perf_counter() - start) * 1000
+    results = {
+        "source": announcer.source,
+        # Neither the tones nor fake_tts.py is a real engine, so the speedup
+        # against them only shows the shape of the saving.
+        "stand_in": announcer.source == soundbox_audio.PLACEHOLDER or os.path.basename(args.tts or "") == "fake_tts.py",
+        "warm_ms": warm_ms,
+        "segments": len(announcer.cache),
+        "cache_bytes": announcer.cache.size,
+        "per_alert_synthesis": time_to_audio(announcer.synthesize, sample[: max(1, args.alerts // 10)]),
+        "cached_segments": time_to_audio(announcer.announce, sample),
+    }
+    results["speedup"] = results["per_alert_synthesis"]["p50_ms"] / results["cached_segments"]["p50_ms"]
+    print(
+        f"source: {results['source']}; warmed {results['segments']} segments "
+        f"({results['cache_bytes'] / 2**20:.1f} MiB) in {warm_ms:.0f} ms",
+        file=sys.stderr,
+    )
+    for name in ("per_alert_synthesis", "cached_segments"):
+        r = results[name]
+        print(
+            f"{name:>20}: p50 {r['p50_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms  max {r['max_ms']:8.3f} ms",
+            file=sys.stderr,
+        )
+    print(
+        f"time to first audio: {results['speedup']:.0f}x faster from cached segments than from {results['source']}",
+        file=sys.stderr,
+    )
+    if results["stand_in"]:
+        print(f"note: {results['source']} is a stand-in, not a real TTS engine; compare against one", file=sys.stderr)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
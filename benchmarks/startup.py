@@ -0,0 +1,106 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Run in a fresh interpreter: import the app, then execute the default page
+# once through Streamlit's headless test harness.
+FIRST_RENDER = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file("docs.py", default_timeout=120).run()
+t2 = time.perf_counter()
+print(json.dumps({
+    "harness_import_s": t1 - t0,
+    "first_run_s": t2 - t1,
+    "exception": [str(e.value) for e in at.exception],
+    "end_wall": time.time(),
+}))
+"""
+
+
+def import_times(module):
+    # `python -X importtime` reports self and cumulative microseconds for every
+    # module imported by `import <module>`.
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules = []
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            modules.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return modules
+
+
+def first_render():
+    start = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-c", FIRST_RENDER],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["time_to_first_render_s"] = result.pop("end_wall") - start
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold-start cost of the docs app.")
+    parser.add_argument("--out", default="startup_report.json", help="where to write the JSON report")
+    parser.add_argument("--runs", type=int, default=3, help="cold starts to sample")
+    parser.add_argument("--top", type=int, default=25, help="slowest modules to keep in the report")
+    parser.add_argument("--budget-ms", type=float, help="fail if median time-to-first-render exceeds this")
+    args = parser.parse_args()
+
+    modules = import_times("docs")
+    app_import_ms = next(m["cumulative_ms"] for m in modules if m["module"] == "docs")
+    renders = [first_render() for _ in range(args.runs)]
+    ttfr = sorted(r["time_to_first_render_s"] * 1000 for r in renders)
+    median_ms = ttfr[len(ttfr) // 2]
+
+    report = {
+        "python": sys.version.split()[0],
+        "app_import_ms": app_import_ms,
+        "slowest_imports": sorted(modules, key=lambda m: m["self_ms"], reverse=True)[: args.top],
+        "top_level_imports": [m for m in modules if m["depth"] <= 1],
+        "runs": renders,
+        "time_to_first_render_ms": {"median": median_ms, "min": ttfr[0], "max": ttfr[-1]},
+        "budget_ms": args.budget_ms,
+    }
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"import docs: {app_import_ms:.0f} ms, time to first render: {median_ms:.0f} ms (median of {args.runs})")
+    errors = [e for r in renders for e in r["exception"]]
+    if errors:
+        print("first render raised: " + "; ".join(errors), file=sys.stderr)
+        sys.exit(1)
+    if args.budget_ms is not None and median_ms > args.budget_ms:
+        print(f"over budget: {median_ms:.0f} ms > {args.budget_ms:.0f} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
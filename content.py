@@ -0,0 +1,169 @@
+import functools
+import hashlib
+import json
+import os
+import textwrap
+import threading
+
+import streamlit as st
+
+import assets
+import metrics
+
+CONTENT_DIR = os.environ.get("NEXTPAY_CONTENT_DIR", "content")
+MANIFEST_PATH = os.path.join(CONTENT_DIR, "manifest.json")
+
+# path -> (mtime_ns, size, sha256, compiled). Shared by every session in the
+# process; a file is only re-read when its mtime or size changes, and only
+# recompiled when its content hash changes.
+_sources = {}
+# page -> (versions of the files it was built from, compiled page)
+_pages = {}
+stats = {"hits": 0, "misses": 0}
+_lock = threading.Lock()
+# Set by the static exporter while it captures a page: called in place of
+# every live_only panel.
+live_placeholder = None
+
+
+def _compile_markdown(text):
+    # Same normalisation st.markdown applies on every call, done once here.
+    return textwrap.dedent(text).strip()
+
+
+def _compile_manifest(text):
+    return json.loads(text)
+
+
+def _load(path, compile):
+    stat = os.stat(path)
+    cached = _sources.get(path)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        stats["hits"] += 1
+        return cached[2], cached[3]
+    stats["misses"] += 1
+
+    with open(path, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+    if cached and cached[2] == digest:
+        compiled = cached[3]
+    else:
+        compiled = compile(raw.decode("utf-8"))
+    _sources[path] = (stat.st_mtime_ns, stat.st_size, digest, compiled)
+    return digest, compiled
+
+
+def manifest():
+    with _lock:
+        return _load(MANIFEST_PATH, _compile_manifest)[1]
+
+
+def data(name):
+    # A JSON file under CONTENT_DIR as (sha256, parsed), cached like the pages.
+    with _lock:
+        return _load(os.path.join(CONTENT_DIR, name), _compile_manifest)
+
+
+def page(name):
+    # Returns {"title": ..., "blocks": [...]} with every markdown block's text
+    # resolved. Rebuilt only when the manifest or one of its files changes.
+    with _lock:
+        manifest_digest, pages = _load(MANIFEST_PATH, _compile_manifest)
+        spec = pages[name]
+        versions = [manifest_digest]
+        blocks = []
+        for block in spec["blocks"]:
+            if "markdown" in block:
+                path = os.path.join(CONTENT_DIR, block["markdown"])
+                digest, text = _load(path, _compile_markdown)
+                versions.append(digest)
+                block = {**block, "text": text}
+            blocks.append(block)
+
+        cached = _pages.get(name)
+        if cached and cached[0] == versions:
+            return cached[1]
+        compiled = {"title": spec["title"], "blocks": blocks, "units": _units(name, blocks)}
+        _pages[name] = (versions, compiled)
+        return compiled
+
+
+def _units(name, blocks):
+    # Group blocks into render units: runs of eager blocks within a section,
+    # and lazy groups. A subheader marked "lazy" stays visible but the blocks
+    # under it become one lazy group; an image marked "lazy" is a group of its
+    # own. "lazy" may be a string to use as the expander label.
+    units = []
+    section = "intro"
+    lazy_section = None
+    for block in blocks:
+        if "subheader" in block:
+            section = block.get("id", section)
+            lazy_section = block.get("lazy")
+            units.append({"section": section, "lazy": None, "blocks": [block]})
+            continue
+        if lazy_section:
+            label = lazy_section if isinstance(lazy_section, str) else "Show details"
+        elif block.get("lazy"):
+            label = block["lazy"] if isinstance(block["lazy"], str) else f"🖼️ {block.get('caption', 'Show image')}"
+            units.append({"section": section, "lazy": label, "blocks": [block]})
+            continue
+        else:
+            label = None
+        last = units[-1] if units else None
+        if last and last["section"] == section and last["lazy"] == label:
+            last["blocks"].append(block)
+        else:
+            units.append({"section": section, "lazy": label, "blocks": [block]})
+    for i, unit in enumerate(units):
+        unit["key"] = f"{name}:{unit['section']}:{i}"
+    return units
+
+
+def render_block(block):
+    if "subheader" in block:
+        st.subheader(block["subheader"], anchor=block.get("id"))
+    elif "markdown" in block:
+        st.markdown(block["text"])
+    elif "image" in block:
+        assets.image(block["image"], caption=block.get("caption"), stretch=block.get("stretch", False))
+
+
+def expandable_blocks(key, label, blocks):
+    # Nothing inside is rendered or sent until the reader opens the expander.
+    expander = st.expander(label, key=key, on_change="rerun")
+    if expander.open:
+        with expander:
+            for block in blocks:
+                render_block(block)
+
+
+# As a fragment, opening or closing the expander reruns only that section.
+lazy_blocks = st.fragment(expandable_blocks)
+
+
+def live_only(panel):
+    # Marks an interactive panel (usually a fragment) that only works in the
+    # live app; the static export shows a note in its place.
+    @functools.wraps(panel)
+    def run(*args, **kwargs):
+        if live_placeholder is not None:
+            return live_placeholder()
+        return panel(*args, **kwargs)
+
+    return run
+
+
+def render(name):
+    compiled = page(name)
+    st.title(compiled["title"])
+    # A section runs from one subheader to the next; blocks before the first
+    # subheader belong to "intro".
+    for unit in compiled["units"]:
+        with metrics.timer("nextpay_section_render_seconds", page=name, section=unit["section"]):
+            if unit["lazy"]:
+                lazy_blocks(unit["key"], unit["lazy"], unit["blocks"])
+            else:
+                for block in unit["blocks"]:
+                    render_block(block)
@@ -0,0 +1,341 @@
+import argparse
+import hashlib
+import html
+import os
+import re
+import shutil
+import sys
+from contextlib import contextmanager
+
+import markdown
+import streamlit
+
+import assets
+import content
+import docs
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "sane_lists"]
+# Written into the output directory so a later run knows it may replace it.
+MARKER = ".nextpay-export"
+LIST_ITEM = re.compile(r"^ *(?:[-*+]|\d+[.)]) +\S")
+FENCE = re.compile(r"^ *(?:```|~~~)")
+# A list marker left at the start of a line of text means a list was
+# rendered as a paragraph.
+LITERAL_MARKER = re.compile(r"^(?:<p>)?(?:[-*+]|\d+[.)]) +\S", re.MULTILINE)
+PRE = re.compile(r"<pre>.*?</pre>", re.DOTALL)
+IMAGE_SIZES = "(max-width: 800px) 100vw, 730px"
+
+STYLE = """
+body { margin: 0; font-family: "Source Sans Pro", system-ui, sans-serif; color: #31333f; line-height: 1.6; }
+.layout { display: flex; min-height: 100vh; }
+nav { width: 244px; flex-shrink: 0; background: #f0f2f6; padding: 2rem 1rem; }
+nav h2 { font-size: 1.25rem; margin-top: 0; }
+nav ul { list-style: none; padding: 0; }
+nav a { display: block; padding: .3rem .5rem; border-radius: .4rem; color: inherit; text-decoration: none; }
+nav a.active, nav a:hover { background: #e0e3ea; }
+main { max-width: 730px; padding: 3rem 1.5rem; margin: 0 auto; }
+h1 { font-size: 2.5rem; line-height: 1.2; }
+figure { margin: 1rem 0; }
+picture img { max-width: 100%; height: auto; }
+figcaption { text-align: center; color: #808495; font-size: .9rem; }
+pre { background: #f0f2f6; padding: 1rem; border-radius: .5rem; overflow-x: auto; }
+code { font-size: .875em; }
+.live-only { color: #808495; font-style: italic; }
+@media (max-width: 800px) { .layout { flex-direction: column; } nav { width: auto; } }
+"""
+
+PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{title} · nextPay</title>
+<link rel="stylesheet" href="{root}{stylesheet}">
+</head>
+<body>
+<div class="layout">
+<nav>
+<h2>Navigation</h2>
+<ul>
+{navigation}
+</ul>
+</nav>
+<main>
+{body}
+</main>
+</div>
+</body>
+</html>
+"""
+
+
+class _Noop:
+    # Stands in for widgets and containers the static site can't reproduce.
+    def __call__(self, *args, **kwargs):
+        return self
+
+    def __getattr__(self, name):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __bool__(self):
+        return False
+
+    def __iter__(self):
+        return iter(())
+
+
+class _Expander:
+    # Static pages have no interaction, so expanders are rendered open.
+    open = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class Capture:
+    # Minimal stand-in for the `streamlit` module that records what a page
+    # function renders instead of sending it to a browser.
+    def __init__(self):
+        self.elements = []
+        self.skipped = []
+
+    def title(self, body, anchor=None, **kwargs):
+        self.elements.append(("title", body, anchor))
+
+    def header(self, body, anchor=None, **kwargs):
+        self.elements.append(("header", body, anchor))
+
+    def subheader(self, body, anchor=None, **kwargs):
+        self.elements.append(("subheader", body, anchor))
+
+    def markdown(self, body, unsafe_allow_html=False, **kwargs):
+        self.elements.append(("markdown", body, unsafe_allow_html))
+
+    def write(self, *args, **kwargs):
+        for arg in args:
+            if isinstance(arg, str):
+                self.markdown(arg)
+            else:
+                self.skipped.append("write")
+
+    def code(self, body, language="python", **kwargs):
+        self.elements.append(("code", body, language))
+
+    def button(self, label, **kwargs):
+        # Buttons only reveal extra content in this app, so show that content.
+        return True
+
+    def toggle(self, label, **kwargs):
+        # Toggles here start live demos, which a static page can't run.
+        self.elements.append(("live-only",))
+        return False
+
+    def image(self, *args, **kwargs):
+        self.skipped.append("image")
+
+    def expander(self, label, **kwargs):
+        return _Expander()
+
+    def __getattr__(self, name):
+        self.skipped.append(name)
+        return _Noop()
+
+
+@contextmanager
+def capturing(capture):
+    patched = [m for m in list(sys.modules.values()) if getattr(m, "st", None) is streamlit]
+    original_image = assets.image
+
+    def image(name, caption=None, stretch=False, width=None):
+        capture.elements.append(("image", name, caption))
+
+    def live_only(*args, **kwargs):
+        capture.elements.append(("live-only",))
+
+    for module in patched:
+        module.st = capture
+    assets.image = image
+    # Fragments only run inside a Streamlit script run. Panels marked
+    # content.live_only get a placeholder instead; lazy sections are static
+    # content, so call the plain function behind them.
+    content.live_placeholder = live_only
+    content.lazy_blocks = content.expandable_blocks
+    try:
+        yield capture
+    finally:
+        for module in patched:
+            module.st = streamlit
+        assets.image = original_image
+        content.live_placeholder = None
+
+
+def _normalise_lists(text):
+    # Streamlit's renderer starts a list right after a paragraph line, but
+    # Python-Markdown needs a blank line first, so add one where it's missing.
+    lines = []
+    fenced = in_list = False
+    for line in text.split("\n"):
+        if FENCE.match(line):
+            # A fence also ends the list as far as Python-Markdown is concerned.
+            fenced = not fenced
+            in_list = False
+        elif not fenced and LIST_ITEM.match(line):
+            if lines and lines[-1].strip() and not in_list:
+                lines.append("")
+            in_list = True
+        elif not line.strip():
+            in_list = False
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def literal_list_markers(document):
+    return LITERAL_MARKER.findall(PRE.sub("", document))
+
+
+def _inline(text):
+    rendered = markdown.markdown(text)
+    if rendered.startswith("<p>") and rendered.endswith("</p>"):
+        rendered = rendered[3:-4]
+    return rendered
+
+
+class Exporter:
+    def __init__(self, out_dir):
+        self.out_dir = out_dir
+        self.copied = set()
+
+    def fingerprint(self, data, name, ext):
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        relative = f"static/{name}.{digest}.{ext}"
+        path = os.path.join(self.out_dir, relative)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+        return relative
+
+    def copy_variant(self, file):
+        relative = f"img/{file}"
+        if relative not in self.copied:
+            target = os.path.join(self.out_dir, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.copyfile(os.path.join(assets.CACHE_DIR, file), target)
+            self.copied.add(relative)
+        return relative
+
+    def picture(self, name, caption, root):
+        entry = assets.get_manifest()[name]
+        sources = []
+        fallback = None
+        for fmt in ("avif", "webp", "jpeg"):
+            variants = entry["variants"].get(fmt)
+            if not variants:
+                continue
+            srcset = ", ".join(
+                f"{root}{self.copy_variant(file)} {width}w"
+                for width, file in sorted(variants.items(), key=lambda item: int(item[0]))
+            )
+            if fmt == "jpeg":
+                fallback = (srcset, root + self.copy_variant(os.path.basename(assets.variant_path(name))))
+            else:
+                sources.append(f'<source type="image/{fmt}" srcset="{srcset}" sizes="{IMAGE_SIZES}">')
+
+        alt = html.escape(caption or name)
+        height = round(entry["height"] * min(entry["width"], assets.DEFAULT_WIDTH) / entry["width"])
+        img = (
+            f'<img src="{fallback[1]}" srcset="{fallback[0]}" sizes="{IMAGE_SIZES}" '
+            f'width="{min(entry["width"], assets.DEFAULT_WIDTH)}" height="{height}" alt="{alt}" loading="lazy" decoding="async">'
+        )
+        figcaption = f"<figcaption>{html.escape(caption)}</figcaption>" if caption else ""
+        return f"<figure><picture>{''.join(sources)}{img}</picture>{figcaption}</figure>"
+
+    def body(self, capture, root):
+        parts = []
+        for kind, *rest in capture.elements:
+            if kind in ("title", "header", "subheader"):
+                body, anchor = rest
+                tag = {"title": "h1", "header": "h2", "subheader": "h3"}[kind]
+                attr = f' id="{html.escape(anchor)}"' if anchor else ""
+                parts.append(f"<{tag}{attr}>{_inline(body)}</{tag}>")
+            elif kind == "markdown":
+                body, unsafe = rest
+                parts.append(body if unsafe else markdown.markdown(_normalise_lists(body), extensions=MARKDOWN_EXTENSIONS))
+            elif kind == "code":
+                body, language = rest
+                parts.append(f'<pre><code class="language-{language}">{html.escape(body)}</code></pre>')
+            elif kind == "image":
+                name, caption = rest
+                parts.append(self.picture(name, caption, root))
+            elif kind == "live-only":
+                parts.append('<p class="live-only">This interactive panel is only available in the live app.</p>')
+        if capture.skipped:
+            parts.append('<p class="live-only">Some interactive parts of this page are only available in the live app.</p>')
+        return "\n".join(parts)
+
+    def nav_item(self, label, url_path, root, active):
+        href = root + ("" if label == docs.DEFAULT_PAGE else url_path + "/")
+        css = ' class="active"' if active else ""
+        return f'<li><a href="{href}"{css}>{html.escape(label)}</a></li>'
+
+    def prepare(self):
+        # Only replace a directory an earlier export created, so a mistyped
+        # --out can't wipe anything else.
+        if os.path.isdir(self.out_dir) and os.listdir(self.out_dir):
+            if not os.path.exists(os.path.join(self.out_dir, MARKER)):
+                raise SystemExit(f"{self.out_dir} is not empty and wasn't created by this exporter; refusing to replace it")
+            shutil.rmtree(self.out_dir)
+        os.makedirs(self.out_dir, exist_ok=True)
+        with open(os.path.join(self.out_dir, MARKER), "w") as f:
+            f.write("Created by export_static.py. The whole directory is replaced on the next export.\n")
+
+    def export(self):
+        self.prepare()
+        stylesheet = self.fingerprint(STYLE.encode("utf-8"), "style", "css")
+
+        for label, (_, _, url_path) in docs.PAGES.items():
+            page = docs.load_page(label)
+            with capturing(Capture()) as capture:
+                page()
+
+            is_default = label == docs.DEFAULT_PAGE
+            root = "" if is_default else "../"
+            navigation = "\n".join(
+                self.nav_item(other, path, root, active=other == label)
+                for other, (_, _, path) in docs.PAGES.items()
+            )
+            document = PAGE.format(
+                title=html.escape(label),
+                root=root,
+                stylesheet=stylesheet,
+                navigation=navigation,
+                body=self.body(capture, root),
+            )
+            markers = literal_list_markers(document)
+            if markers:
+                raise SystemExit(f"{label}: {len(markers)} list items rendered as plain text, e.g. {markers[0]!r}")
+            target = os.path.join(self.out_dir, "index.html" if is_default else os.path.join(url_path, "index.html"))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8") as f:
+                f.write(document)
+            skipped = f" (skipped: {', '.join(sorted(set(capture.skipped)))})" if capture.skipped else ""
+            print(f"{label}: {target}{skipped}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the docs pages as a static site.")
+    parser.add_argument("--out", default="site", help="output directory (replaced on each run if an earlier export created it)")
+    args = parser.parse_args()
+    Exporter(args.out).export()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+
+import numpy as np
+import streamlit as st
+
+import content
+import soundbox_live
+
+# A fee snapshot file, or an http(s) URL of a service returning the same JSON.
+FEES_SOURCE = os.environ.get("NEXTPAY_FEES", os.path.join("fixtures", "fees.json"))
+# Seconds a fee snapshot is used before the source is read again.
+SNAPSHOT_TTL = 60
+# Seconds a computed quote is reused, and how many are kept.
+QUOTE_TTL = 300
+QUOTE_CACHE_SIZE = 256
+# Amounts charted on the calculator, in USD.
+CURVE = np.geomspace(10, 100_000, 200)
+CHART = {
+    "mark": "line",
+    "encoding": {
+        "x": {"field": "amount (USD)", "type": "quantitative", "scale": {"type": "log"}},
+        "y": {"field": "fee (%)", "type": "quantitative", "scale": {"type": "log"}},
+        "color": {"field": "route", "type": "nominal"},
+    },
+}
+
+
+class TTLCache:
+    # LRU whose entries also expire `ttl` seconds after they were stored.
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            now = time.monotonic()
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while self._entries and (len(self._entries) > self.maxsize or next(iter(self._entries.values()))[0] <= now):
+                self._entries.popitem(last=False)
+
+
+class Snapshot:
+    # A fee table as arrays indexed by chain position, so that every route is
+    # priced with broadcasting instead of Python loops.
+    def __init__(self, table):
+        self.digest = hashlib.sha256(json.dumps(table, sort_keys=True).encode()).hexdigest()
+        self.chains = list(table["chains"])
+        n = len(self.chains)
+        specs = [table["chains"][c] for c in self.chains]
+        price = np.array([s["gas_price_gwei"] * 1e-9 * s["native_usd"] for s in specs])
+        send = price * [s["transfer_gas"] for s in specs]
+        claim = price * [s["claim_gas"] for s in specs]
+
+        # One hop from chain i to chain j: gas on i, plus the bridge's cut
+        # and the claim on j when they differ. Missing bridges cost inf.
+        self.gas = np.where(np.eye(n, dtype=bool), send[:, None], send[:, None] + claim[None, :])
+        self.fixed = np.full((n, n), np.inf)
+        self.rate = np.zeros((n, n))
+        self.minutes = np.full((n, n), np.inf)
+        for i, spec in enumerate(specs):
+            self.fixed[i, i] = 0.0
+            self.minutes[i, i] = spec["finality_minutes"]
+        for route, spec in table["bridges"].items():
+            i, j = (self.chains.index(c) for c in route.split("->"))
+            self.fixed[i, j] = spec["fixed_usd"]
+            self.rate[i, j] = spec["bps"] / 10_000
+            self.minutes[i, j] = spec["minutes"]
+
+
+class Quote:
+    # Prices for amounts[a] sent from chain i to chain j along route r, where
+    # r = 0 is the direct hop and r = k + 1 relays through chain k.
+    def __init__(self, snapshot, amounts):
+        self.snapshot = snapshot
+        self.amounts = amounts
+        n = len(snapshot.chains)
+        a = amounts[:, None, None]
+        fixed, rate, gas = snapshot.fixed, snapshot.rate, snapshot.gas
+
+        # (amounts, i, j) after one hop, then (amounts, i, k, j) after two.
+        direct = a * (1 - rate) - fixed
+        relayed = direct[:, :, :, None] * (1 - rate[None, None, :, :]) - fixed[None, None, :, :]
+        relay_gas = gas[:, :, None] + gas[None, :, :]
+        relay_minutes = snapshot.minutes[:, :, None] + snapshot.minutes[None, :, :]
+
+        # Relaying through either endpoint is just the direct route again.
+        k = np.arange(n)
+        useless = (k[None, :, None] == k[:, None, None]) | (k[None, :, None] == k[None, None, :])  # (i, k, j)
+        relayed = np.where(useless[None], -np.inf, relayed)
+
+        # received: (amounts, i, j, route); fee includes gas paid separately.
+        self.received = np.concatenate([direct[..., None], relayed.transpose(0, 1, 3, 2)], axis=3)
+        gas_all = np.concatenate([gas[..., None], relay_gas.transpose(0, 2, 1)], axis=2)
+        self.minutes = np.concatenate([snapshot.minutes[..., None], relay_minutes.transpose(0, 2, 1)], axis=2)
+        self.fee = np.where(self.received > 0, a[..., None] - self.received + gas_all, np.inf)
+        self.best = self.fee.argmin(axis=3)
+        self.best_fee = np.take_along_axis(self.fee, self.best[..., None], axis=3)[..., 0]
+
+    def route_name(self, r):
+        return "Direct" if r == 0 else f"via {self.snapshot.chains[r - 1]}"
+
+    def routes(self, src, dst, index=0):
+        # Viable routes for one amount, cheapest first.
+        i, j = self.snapshot.chains.index(src), self.snapshot.chains.index(dst)
+        fees = self.fee[index, i, j]
+        return [
+            {
+                "route": self.route_name(r),
+                "fee (USD)": float(fees[r]),
+                "fee (%)": float(fees[r] / self.amounts[index] * 100),
+                "received (USD)": float(self.received[index, i, j, r]),
+                "minutes": float(self.minutes[i, j, r]),
+            }
+            for r in np.argsort(fees)
+            if np.isfinite(fees[r])
+        ]
+
+
+def load_table(source=FEES_SOURCE):
+    if source.startswith(("http://", "https://")):
+        with urllib.request.urlopen(source, timeout=10) as response:
+            return json.load(response)
+    with open(source) as f:
+        return json.load(f)
+
+
+class RouteEngine:
+    def __init__(self, source=FEES_SOURCE):
+        self.source = source
+        self.quotes = TTLCache(QUOTE_TTL, QUOTE_CACHE_SIZE)
+        # Why the last refresh failed, while an older snapshot is served.
+        self.error = None
+        self._snapshot = None
+        self._loaded = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        with self._lock:
+            now = time.monotonic()
+            if self._snapshot is None or now - self._loaded >= SNAPSHOT_TTL:
+                try:
+                    snapshot = Snapshot(load_table(self.source))
+                except (OSError, ValueError, KeyError, TypeError) as e:
+                    # Keep pricing with the last good snapshot and try the
+                    # source again after another SNAPSHOT_TTL.
+                    if self._snapshot is None:
+                        raise
+                    self.error = e
+                    self._loaded = now
+                    return self._snapshot
+                self.error = None
+                # Keep the old object when nothing changed; quotes are keyed
+                # on the digest, so they stay valid either way.
+                if self._snapshot is None or snapshot.digest != self._snapshot.digest:
+                    self._snapshot = snapshot
+                self._loaded = now
+            return self._snapshot
+
+    def quote(self, amounts):
+        snapshot = self.snapshot()
+        amounts = np.atleast_1d(np.asarray(amounts, dtype=float))
+        key = (snapshot.digest, amounts.tobytes())
+        quote = self.quotes.get(key)
+        if quote is None:
+            quote = Quote(snapshot, amounts)
+            self.quotes.put(key, quote)
+        return quote
+
+
+@st.cache_resource(show_spinner=False)
+def get_engine():
+    return RouteEngine()
+
+
+@content.live_only
+@st.fragment
+def _calculator():
+    engine = get_engine()
+    chains = engine.snapshot().chains
+    if engine.error:
+        st.caption(f"Couldn't refresh the fee data ({engine.error}), so these are the last known fees.")
+    label = lambda chain: soundbox_live.CHAINS.get(chain, chain)
+
+    cols = st.columns(3)
+    amount = cols[0].number_input("Amount (USD)", min_value=1.0, value=250.0, step=50.0, key="fees_amount")
+    src = cols[1].selectbox("From", chains, format_func=label, key="fees_from")
+    dst = cols[2].selectbox("To", chains, index=min(2, len(chains) - 1), format_func=label, key="fees_to")
+
+    # The chart curve is the same for everyone, so after the first session it
+    # comes from the memo; only the typed amount is new work.
+    quote = engine.quote(amount)
+    curve = engine.quote(CURVE)
+    st.dataframe(quote.routes(src, dst), hide_index=True)
+
+    i, j = chains.index(src), chains.index(dst)
+    st.caption(f"Fee by amount on each route, {src} → {dst}")
+    fees = curve.fee[:, i, j]
+    # A plain Vega-Lite spec: st.line_chart rebuilds an Altair chart on every
+    # rerun, which costs far more than pricing the routes.
+    st.vega_lite_chart(
+        [
+            {"amount (USD)": amount_usd, "route": curve.route_name(r), "fee (%)": fee}
+            for r in range(fees.shape[1])
+            if np.isfinite(fees[:, r]).any()
+            for amount_usd, fee in zip(CURVE.tolist(), (fees[:, r] / CURVE * 100).tolist())
+            if fee != float("inf")
+        ],
+        CHART,
+        width="stretch",
+    )
+    st.caption(f"Best fee (USD) for {amount:,.0f} USD between every pair of chains")
+    st.dataframe(
+        [
+            {"from": src_chain, **{dst_chain: round(float(fee), 2) for dst_chain, fee in zip(chains, row)}}
+            for src_chain, row in zip(chains, quote.best_fee[0])
+        ],
+        hide_index=True,
+    )
+
+
+def panel():
+    st.subheader("💸 Fee Calculator", anchor="fee-calculator")
+    st.write(
+        "Compare what a transfer costs on each route between the supported chains, "
+        "including relaying through a third chain when that is cheaper."
+    )
+    _calculator()
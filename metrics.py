@@ -0,0 +1,239 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import streamlit as st
+
+ENABLED = os.environ.get("NEXTPAY_METRICS", "0") == "1"
+METRICS_FILE = os.environ.get("NEXTPAY_METRICS_FILE")
+METRICS_PORT = os.environ.get("NEXTPAY_METRICS_PORT")
+# Minimum seconds between rewrites of METRICS_FILE.
+FILE_INTERVAL = 10
+
+# Seconds; Prometheus' default buckets shifted down to cover fast sections.
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+HELP = {
+    "nextpay_page_render_seconds": "Time to run a page function.",
+    "nextpay_section_render_seconds": "Time to render one section of a page.",
+    "nextpay_reruns_total": "Page reruns.",
+    "nextpay_media_bytes_total": "Image bytes handed to Streamlit.",
+    "nextpay_cache_hits_total": "Process-wide cache hits.",
+    "nextpay_cache_misses_total": "Process-wide cache misses.",
+}
+
+_NULL = nullcontext()
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        i = 0
+        while i < len(BUCKETS) and value > BUCKETS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q):
+        # Upper bound of the bucket holding the q-th observation.
+        target = q * self.count
+        seen = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), self.counts):
+            seen += count
+            if seen >= target:
+                return bound
+        return float("inf")
+
+
+_histograms = {}
+_counters = {}
+_lock = threading.Lock()
+_last_write = 0.0
+_server = None
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def observe(name, value, **labels):
+    with _lock:
+        key = _key(name, labels)
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value)
+
+
+def inc(name, value=1, **labels):
+    if not ENABLED:
+        return
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+@contextmanager
+def _timed(name, labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def timer(name, **labels):
+    return _timed(name, labels) if ENABLED else _NULL
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+def _cache_counters():
+    # Caches keep their own hit/miss counts; read them at scrape time.
+    import assets
+    import content
+
+    counters = {
+        "assets": (assets._cache.hits, assets._cache.misses),
+        "content": (content.stats["hits"], content.stats["misses"]),
+    }
+    # Only report the fee quote cache once its page has been visited.
+    fee_routes = sys.modules.get("fee_routes")
+    if fee_routes is not None:
+        quotes = fee_routes.get_engine().quotes
+        counters["fee_quotes"] = (quotes.hits, quotes.misses)
+    architecture = sys.modules.get("architecture")
+    if architecture is not None:
+        counters["architecture_layouts"] = (architecture.stats["hits"], architecture.stats["misses"])
+    soundbox_audio = sys.modules.get("soundbox_audio")
+    if soundbox_audio is not None:
+        segments = soundbox_audio.get_announcer().cache
+        counters["soundbox_segments"] = (segments.hits, segments.misses)
+    return counters
+
+
+def render():
+    lines = []
+    with _lock:
+        histograms = sorted(_histograms.items())
+        counters = sorted(_counters.items())
+
+    seen = set()
+    for (name, labels), histogram in histograms:
+        if name not in seen:
+            seen.add(name)
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} histogram"]
+        cumulative = 0
+        for bound, count in zip(BUCKETS + (float("inf"),), histogram.counts):
+            cumulative += count
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', le)])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum}")
+        lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+    for (name, labels), value in counters:
+        if name not in seen:
+            seen.add(name)
+            lines += [f"# HELP {name} {HELP.get(name, name)}", f"# TYPE {name} counter"]
+        lines.append(f"{name}{_format_labels(labels)} {value}")
+
+    caches = _cache_counters()
+    for name, index in (("nextpay_cache_hits_total", 0), ("nextpay_cache_misses_total", 1)):
+        lines += [f"# HELP {name} {HELP[name]}", f"# TYPE {name} counter"]
+        for cache, values in caches.items():
+            lines.append(f'{name}{{cache="{cache}"}} {values[index]}')
+    return "\n".join(lines) + "\n"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server():
+    global _server
+    with _lock:
+        if _server is not None or not METRICS_PORT:
+            return
+        _server = ThreadingHTTPServer(("127.0.0.1", int(METRICS_PORT)), _Handler)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+
+def write_file():
+    global _last_write
+    now = time.monotonic()
+    if not METRICS_FILE or now - _last_write < FILE_INTERVAL:
+        return
+    _last_write = now
+    tmp = METRICS_FILE + ".tmp"
+    with open(tmp, "w") as f:
+        f.write(render())
+    os.replace(tmp, METRICS_FILE)
+
+
+def export():
+    # Called once per rerun by main(); cheap when there is nothing to do.
+    if not ENABLED:
+        return
+    start_server()
+    write_file()
+
+
+def admin_panel():
+    with _lock:
+        rows = [
+            (dict(labels), histogram.count, histogram.sum / histogram.count, histogram.quantile(0.95))
+            for (name, labels), histogram in sorted(_histograms.items())
+            if name == "nextpay_page_render_seconds" and histogram.count
+        ]
+        sections = sorted(
+            (
+                (histogram.sum, dict(labels))
+                for (name, labels), histogram in _histograms.items()
+                if name == "nextpay_section_render_seconds"
+            ),
+            key=lambda row: row[0],
+            reverse=True,
+        )[:10]
+
+    with st.sidebar.expander("Render metrics"):
+        st.dataframe(
+            [
+                {"page": labels["page"], "reruns": count, "mean ms": mean * 1000, "p95 ≤ ms": p95 * 1000}
+                for labels, count, mean, p95 in rows
+            ],
+            hide_index=True,
+        )
+        st.caption("Slowest sections (total time)")
+        st.dataframe(
+            [{"page": labels["page"], "section": labels["section"], "total ms": total * 1000} for total, labels in sections],
+            hide_index=True,
+        )
@@ -0,0 +1,405 @@
+import json
+import math
+import os
+import secrets
+import threading
+
+import numpy as np
+import streamlit as st
+
+import content
+
+RECORD = 32  # nullifiers are 32-byte field elements
+ERROR_RATE = 0.01
+MASK64 = (1 << 64) - 1
+# Inserts held in the append buffer before they are merged into the index.
+COMPACT_EVERY = 65_536
+DEMO_SIZE = int(os.environ.get("NEXTPAY_NULLIFIER_DEMO_SIZE", 250_000))
+
+
+def to_key(value):
+    # A nullifier as hex, int or bytes -> its 32 big-endian bytes.
+    if isinstance(value, str):
+        value = int(value, 16)
+    if isinstance(value, int):
+        if not 0 <= value < 1 << 8 * RECORD:
+            raise ValueError(f"nullifiers are {RECORD} bytes")
+        return value.to_bytes(RECORD, "big")
+    value = bytes(value)
+    if len(value) != RECORD:
+        raise ValueError(f"nullifiers are {RECORD} bytes, got {len(value)}")
+    return value
+
+
+def to_records(values):
+    # Nullifiers -> an (n, 32) uint8 array, the layout of the index.
+    return np.frombuffer(b"".join(map(to_key, values)), np.uint8).reshape(-1, RECORD)
+
+
+def _u64(records, start):
+    # Big-endian uint64 from bytes [start, start + 8) of each record.
+    return np.ascontiguousarray(records[:, start:start + 8]).view(">u8").ravel().astype(np.uint64)
+
+
+class BloomFilter:
+    # Nullifiers are already uniformly distributed hash outputs, so their own
+    # bytes serve as the two base hashes (double hashing, Kirsch-Mitzenmacher).
+    # The index keys on bytes 0-8; the filter uses 8-24, so they stay independent.
+    def __init__(self, capacity, error_rate=ERROR_RATE):
+        self.capacity = max(capacity, 1024)
+        bits = math.ceil(-self.capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = (bits + 63) // 64 * 64
+        self.hashes = max(1, round(self.size / self.capacity * math.log(2)))
+        self.words = np.zeros(self.size // 64, "<u8")
+
+    def _hashes(self, key):
+        h1, h2 = int.from_bytes(key[8:16], "big"), int.from_bytes(key[16:24], "big") | 1
+        # Same uint64 wrap-around as the vectorised _positions().
+        for i in range(self.hashes):
+            yield ((h1 + i * h2) & MASK64) % self.size
+
+    def __contains__(self, key):
+        # Words are little-endian, so bit p is bit p % 8 of byte p // 8, and a
+        # memoryview reads bytes as plain ints without numpy scalar overhead.
+        data = memoryview(self.words).cast("B")
+        for p in self._hashes(key):
+            if not data[p >> 3] >> (p & 7) & 1:
+                return False
+        return True
+
+    def add_key(self, key):
+        for p in self._hashes(key):
+            self.words[p >> 6] |= np.uint64(1 << (p & 63))
+
+    def _positions(self, records):
+        h1, h2 = _u64(records, 8), _u64(records, 16) | np.uint64(1)
+        i = np.arange(self.hashes, dtype=np.uint64)
+        return (h1[:, None] + i[None, :] * h2[:, None]) % np.uint64(self.size)
+
+    def add(self, records):
+        positions = self._positions(records).ravel()
+        if len(positions) < len(self.words):
+            np.bitwise_or.at(self.words, positions >> np.uint64(6), np.uint64(1) << (positions & np.uint64(63)))
+            return
+        # Bulk: scatter into a byte per bit and pack, far faster than ufunc.at.
+        bits = np.zeros(self.size, bool)
+        bits[positions] = True
+        self.words |= np.packbits(bits, bitorder="little").view("<u8")
+
+    def contains(self, records):
+        positions = self._positions(records)
+        bits = (self.words[positions >> np.uint64(6)] >> (positions & np.uint64(63))) & np.uint64(1)
+        return bits.all(axis=1)
+
+
+class NullifierRegistry:
+    """Set of spent nullifiers, answering "was this one used before?".
+
+    A Bloom filter answers most misses without touching the index. Maybes
+    go to a sorted array of records searched by binary search on each
+    record's first eight bytes. New nullifiers land in an append buffer
+    (and an append-only log when the registry is on disk) and are merged
+    into the sorted array every COMPACT_EVERY inserts.
+    """
+
+    def __init__(self, records=None, path=None, error_rate=ERROR_RATE, prefixes=None, bloom=None):
+        self.path = path
+        self.error_rate = error_rate
+        self.records = np.empty((0, RECORD), np.uint8) if records is None else records
+        self.prefixes = _u64(self.records, 0) if prefixes is None else prefixes
+        if bloom is None:
+            bloom = BloomFilter(2 * len(self.records), error_rate)
+            if len(self.records):
+                bloom.add(self.records)
+        self.bloom = bloom
+        self.pending = {}  # bytes -> record, not yet merged
+        self.stats = {"lookups": 0, "bloom_negatives": 0, "false_positives": 0, "compactions": 0}
+        self._lock = threading.Lock()
+        self._log = None
+        self._generation = 0
+
+    @classmethod
+    def bulk_load(cls, records, path=None, error_rate=ERROR_RATE):
+        # Sorts and de-duplicates in bulk: far faster than inserting one by one.
+        records = np.asarray(records, np.uint8).reshape(-1, RECORD)
+        prefixes = _u64(records, 0)
+        order = np.argsort(prefixes, kind="stable")
+        records, prefixes = records[order], prefixes[order]
+        # Duplicates share a prefix, and shared prefixes are rare, so only
+        # those rows are compared in full.
+        keep = np.ones(len(records), bool)
+        shared = np.flatnonzero(prefixes[1:] == prefixes[:-1])
+        seen = set()
+        for row in np.union1d(shared, shared + 1).tolist():
+            key = records[row].tobytes()
+            keep[row] = key not in seen
+            seen.add(key)
+        if not keep.all():
+            records, prefixes = records[keep], prefixes[keep]
+        registry = cls(np.ascontiguousarray(records), path, error_rate, prefixes=prefixes)
+        if path:
+            registry.save()
+        return registry
+
+    # --- lookups ----------------------------------------------------------
+
+    def _in_index(self, records):
+        prefixes = _u64(records, 0)
+        lo = np.searchsorted(self.prefixes, prefixes, side="left")
+        hi = np.searchsorted(self.prefixes, prefixes, side="right")
+        found = np.zeros(len(records), bool)
+        single = hi - lo == 1
+        rows = np.flatnonzero(single)
+        found[rows] = (self.records[lo[rows]] == records[rows]).all(axis=1)
+        # Two records sharing a 64-bit prefix: vanishingly rare, check by hand.
+        for row in np.flatnonzero(hi - lo > 1).tolist():
+            found[row] = (self.records[lo[row]:hi[row]] == records[row]).all(axis=1).any()
+        return found
+
+    def _has_key(self, key):
+        # Scalar path for one nullifier: numpy calls on 1-element arrays cost
+        # more than the lookup itself.
+        prefix = int.from_bytes(key[:8], "big")
+        i = int(self.prefixes.searchsorted(np.uint64(prefix)))
+        while i < len(self.prefixes) and int(self.prefixes[i]) == prefix:
+            if self.records[i].tobytes() == key:
+                return True
+            i += 1
+        return False
+
+    def contains_many(self, records):
+        records = np.asarray(records, np.uint8).reshape(-1, RECORD)
+        with self._lock:
+            maybe = self.bloom.contains(records)
+            found = np.zeros(len(records), bool)
+            rows = np.flatnonzero(maybe)
+            if len(rows):
+                found[rows] = self._in_index(records[rows])
+                for row in rows[~found[rows]].tolist():
+                    found[row] = records[row].tobytes() in self.pending
+            self.stats["lookups"] += len(records)
+            self.stats["bloom_negatives"] += len(records) - len(rows)
+            self.stats["false_positives"] += int(len(rows) - found.sum())
+        return found
+
+    def contains(self, nullifier):
+        return self.explain(nullifier)[0]
+
+    def explain(self, nullifier):
+        # (used, layer that answered): "bloom", "pending" or "index".
+        key = to_key(nullifier)
+        with self._lock:
+            self.stats["lookups"] += 1
+            if key not in self.bloom:
+                self.stats["bloom_negatives"] += 1
+                return False, "bloom"
+            if key in self.pending:
+                return True, "pending"
+            found = self._has_key(key)
+            self.stats["false_positives"] += not found
+            return found, "index"
+
+    # --- inserts ----------------------------------------------------------
+
+    def add(self, nullifier):
+        # Spends a nullifier. Returns False if it had already been used.
+        key = to_key(nullifier)
+        with self._lock:
+            if key in self.bloom and (key in self.pending or self._has_key(key)):
+                return False
+            if self.path:
+                if self._log is None:
+                    self._log = open(os.path.join(self.path, "pending.bin"), "ab")
+                self._log.write(key)
+                self._log.flush()
+            self.pending[key] = np.frombuffer(key, np.uint8)
+            self.bloom.add_key(key)
+            if len(self.pending) >= COMPACT_EVERY:
+                self._compact()
+            return True
+
+    def compact(self):
+        with self._lock:
+            self._compact()
+
+    def _compact(self):
+        if not self.pending:
+            return
+        new = np.stack(list(self.pending.values()))
+        new = new[np.argsort(_u64(new, 0), kind="stable")]
+        new_prefixes = _u64(new, 0)
+        at = np.searchsorted(self.prefixes, new_prefixes)
+        self.records = np.insert(np.asarray(self.records), at, new, axis=0)
+        self.prefixes = np.insert(self.prefixes, at, new_prefixes)
+        if len(self.records) > self.bloom.capacity:
+            # Rebuilt with room to grow once the error rate would drift up.
+            self.bloom = BloomFilter(2 * len(self.records), self.error_rate)
+            self.bloom.add(self.records)
+        self.pending = {}
+        self.stats["compactions"] += 1
+        if self.path:
+            self._save()
+            # Back to a mapped file rather than holding the merged copy.
+            self.records = np.load(self._file("records"), mmap_mode="r")
+
+    # --- persistence ------------------------------------------------------
+
+    def save(self):
+        with self._lock:
+            self._save()
+
+    def _file(self, name, generation=None):
+        return os.path.join(self.path, f"{name}.{generation or self._generation}.npy")
+
+    def _save(self):
+        # Each save writes a new generation of the arrays, and replacing
+        # meta.json commits it: a crash at any point leaves either the old or
+        # the new generation complete, never a mix of the two.
+        os.makedirs(self.path, exist_ok=True)
+        generation = self._generation + 1
+        for name, array in (("records", self.records), ("prefixes", self.prefixes), ("bloom", self.bloom.words)):
+            with open(self._file(name, generation), "wb") as f:
+                np.save(f, array)
+                f.flush()
+                os.fsync(f.fileno())
+        meta = os.path.join(self.path, "meta.json")
+        with open(meta + ".tmp", "w") as f:
+            json.dump({"generation": generation, "capacity": self.bloom.capacity, "error_rate": self.error_rate}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(meta + ".tmp", meta)
+        self._generation = generation
+        current = {os.path.basename(self._file(name)) for name in ("records", "prefixes", "bloom")}
+        for file in os.listdir(self.path):
+            if file.endswith(".npy") and file.startswith(("records.", "prefixes.", "bloom.")) and file not in current:
+                os.remove(os.path.join(self.path, file))
+        # Everything in the log is now in the index. If we crash before the
+        # truncation, open() skips the entries the index already has.
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+        open(os.path.join(self.path, "pending.bin"), "wb").close()
+
+    @classmethod
+    def open(cls, path):
+        # Records are memory-mapped: only the pages lookups touch are read.
+        # Prefixes and the Bloom filter are small enough to keep in memory.
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        file = lambda name: os.path.join(path, f"{name}.{meta['generation']}.npy")
+        bloom = BloomFilter(meta["capacity"], meta["error_rate"])
+        bloom.words = np.load(file("bloom"))
+        registry = cls(
+            np.load(file("records"), mmap_mode="r"),
+            path,
+            meta["error_rate"],
+            prefixes=np.load(file("prefixes")),
+            bloom=bloom,
+        )
+        registry._generation = meta["generation"]
+        # Replay inserts that were logged but never compacted. A torn last
+        # record from a crash mid-write is dropped, and so are records a
+        # compaction merged before it could truncate the log.
+        log = os.path.join(path, "pending.bin")
+        if os.path.exists(log):
+            with open(log, "rb") as f:
+                data = f.read()
+            records = np.frombuffer(data[: len(data) - len(data) % RECORD], np.uint8).reshape(-1, RECORD)
+            records = records[~registry._in_index(records)]
+            if len(records):
+                registry.pending = {record.tobytes(): record for record in records.copy()}
+                registry.bloom.add(records)
+        return registry
+
+    def __len__(self):
+        return len(self.records) + len(self.pending)
+
+    def memory(self):
+        # Bytes held in memory by each part; mapped records count as on disk.
+        mapped = isinstance(self.records, np.memmap)
+        return {
+            "bloom": self.bloom.words.nbytes,
+            "prefixes": self.prefixes.nbytes,
+            "records": 0 if mapped else self.records.nbytes,
+            "records_on_disk": self.records.nbytes if mapped else 0,
+            "pending": len(self.pending) * (RECORD + 100),
+        }
+
+
+def random_records(count, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (count, RECORD), dtype=np.uint8)
+
+
+@st.cache_resource(show_spinner=False)
+def get_registry():
+    # Stands in for the nullifiers of every proof accepted so far.
+    return NullifierRegistry.bulk_load(random_records(DEMO_SIZE))
+
+
+def _spend(registry, nullifier):
+    if registry.add(nullifier):
+        st.session_state["nullifier_accepted"] = nullifier
+        st.session_state["nullifier_last"] = nullifier
+        st.session_state["nullifier_fresh"] = "0x" + secrets.token_hex(RECORD)
+
+
+@content.live_only
+@st.fragment
+def _registry():
+    registry = get_registry()
+    memory = registry.memory()
+    cols = st.columns(3)
+    cols[0].metric("Nullifiers", f"{len(registry):,}")
+    cols[1].metric("Bloom filter", f"{memory['bloom'] / 2**10:,.0f} KiB")
+    per_million = sum(memory.values()) / len(registry) * 1e6 / 2**20 if len(registry) else None
+    cols[2].metric("Memory per million", "—" if per_million is None else f"{per_million:,.1f} MiB")
+
+    choice = st.radio(
+        "Proof", ["New proof", "Replayed proof", "Enter a nullifier"], horizontal=True, key="nullifier_choice"
+    )
+    if choice == "New proof":
+        nullifier = st.session_state.setdefault("nullifier_fresh", "0x" + secrets.token_hex(RECORD))
+    elif choice == "Replayed proof":
+        nullifier = st.session_state.get("nullifier_last")
+        if nullifier is None:
+            if not len(registry.records):
+                st.caption("Nothing has been spent yet, so there is no proof to replay.")
+                return
+            nullifier = "0x" + registry.records[len(registry.records) // 2].tobytes().hex()
+    else:
+        nullifier = st.text_input("Nullifier (hex)", key="nullifier_input").strip()
+        if not nullifier:
+            return
+    try:
+        used, layer = registry.explain(nullifier)
+    except ValueError:
+        st.error("Not a nullifier: expected up to 64 hex digits.")
+        return
+    st.code(nullifier, language=None)
+    if layer == "bloom":
+        st.write("**Unused.** The Bloom filter ruled it out without touching the index.")
+    elif used:
+        where = "append buffer" if layer == "pending" else "sorted index"
+        st.write(f"**Already used.** The Bloom filter said *maybe*; the {where} confirmed it.")
+    else:
+        st.write("**Unused.** The Bloom filter said *maybe* (a false positive); the sorted index ruled it out.")
+    st.button("Accept proof", disabled=used, on_click=_spend, args=(registry, nullifier), key="nullifier_spend")
+    accepted = st.session_state.pop("nullifier_accepted", None)
+    if accepted:
+        st.success(f"Accepted; {accepted[:18]}… can't be used again.")
+
+    st.caption(
+        f"{len(registry.pending):,} recent nullifiers in the append buffer, merged into the sorted index every "
+        f"{COMPACT_EVERY:,}. {registry.stats['bloom_negatives']:,} of {registry.stats['lookups']:,} lookups "
+        "so far were answered by the Bloom filter alone."
+    )
+
+
+def panel():
+    st.subheader("🛡️ Nullifier Registry", anchor="nullifier-registry")
+    st.write(
+        "Each proof carries a nullifier that is the same every time the same Aadhaar is used, so a "
+        "registry of spent nullifiers stops a proof from being replayed. This one starts with "
+        f"{DEMO_SIZE:,} random nullifiers standing in for earlier proofs."
+    )
+    _registry()
@@ -0,0 +1,223 @@
+import bisect
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+
+import streamlit as st
+
+import content
+
+INDEX_PATH = os.environ.get("NEXTPAY_SEARCH_INDEX", ".search_index.json")
+# Minimum seconds between checks of the content store for edits.
+REFRESH_INTERVAL = 5
+MAX_RESULTS = 8
+
+# BM25 parameters.
+K1 = 1.2
+B = 0.75
+
+TOKEN = re.compile(r"[^\W_]+")
+MARKUP = re.compile(r"```.*?\n|[*_`#>|]|\[([^\]]*)\]\([^)]*\)")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have how in is it its of on or that the this to was we what with you your".split()
+)
+
+
+def tokenize(text):
+    return [t for t in TOKEN.findall(text.lower()) if t not in STOPWORDS]
+
+
+def plain(text):
+    return re.sub(r"\s+", " ", MARKUP.sub(lambda m: m.group(1) or " ", text)).strip()
+
+
+def _deletes(term):
+    # Single-character deletions, used to find terms within edit distance 1
+    # without scanning the vocabulary (the SymSpell trick).
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def documents(pages):
+    # One document per section: a subheader and the markdown under it. Text
+    # before the first subheader is attached to the page title.
+    for name, (label, url_path) in pages.items():
+        compiled = content.page(name)
+        section_id, heading, parts = None, compiled["title"], []
+        for block in compiled["blocks"] + [{"id": "", "subheader": ""}]:
+            if "subheader" in block:
+                if parts or section_id is None:
+                    yield {
+                        "id": f"{name}#{section_id or ''}",
+                        "page": label,
+                        "url": url_path,
+                        "anchor": section_id,
+                        "heading": plain(heading),
+                        "text": plain(" ".join(parts)),
+                    }
+                section_id, heading, parts = block["id"], block["subheader"], []
+            elif "text" in block:
+                parts.append(block["text"])
+
+
+class Index:
+    def __init__(self):
+        self.docs = {}  # doc id -> metadata, term frequencies, length, hash
+        self.postings = {}  # term -> {doc id: term frequency}
+        self.vocabulary = []  # sorted terms, for prefix lookups
+        self.deletes = {}  # single-deletion variant -> terms
+        self.total_length = 0
+        self._lock = threading.Lock()
+        self._checked = 0.0
+
+    def _add(self, doc):
+        self.docs[doc["id"]] = doc
+        self.total_length += doc["length"]
+        for term, tf in doc["tf"].items():
+            postings = self.postings.get(term)
+            if postings is None:
+                postings = self.postings[term] = {}
+                bisect.insort(self.vocabulary, term)
+                for variant in _deletes(term):
+                    self.deletes.setdefault(variant, set()).add(term)
+            postings[doc["id"]] = tf
+
+    def _remove(self, doc_id):
+        doc = self.docs.pop(doc_id)
+        self.total_length -= doc["length"]
+        for term in doc["tf"]:
+            postings = self.postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self.postings[term]
+                del self.vocabulary[bisect.bisect_left(self.vocabulary, term)]
+                for variant in _deletes(term):
+                    self.deletes[variant].discard(term)
+
+    def sync(self, pages):
+        # Re-tokenise only sections whose text changed; returns True if the
+        # index was modified.
+        changed = False
+        seen = set()
+        for doc in documents(pages):
+            digest = hashlib.sha256((doc["heading"] + "\0" + doc["text"]).encode()).hexdigest()
+            seen.add(doc["id"])
+            existing = self.docs.get(doc["id"])
+            if existing and existing["hash"] == digest and existing["url"] == doc["url"]:
+                continue
+            if existing:
+                self._remove(doc["id"])
+            tokens = tokenize(doc["heading"]) * 2 + tokenize(doc["text"])
+            tf = {}
+            for token in tokens:
+                tf[token] = tf.get(token, 0) + 1
+            self._add({**doc, "hash": digest, "tf": tf, "length": len(tokens)})
+            changed = True
+        for doc_id in set(self.docs) - seen:
+            self._remove(doc_id)
+            changed = True
+        return changed
+
+    def refresh(self, pages):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked < REFRESH_INTERVAL:
+                return
+            self._checked = now
+            if self.sync(pages):
+                self.save()
+
+    def save(self):
+        tmp = INDEX_PATH + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"docs": list(self.docs.values())}, f)
+        os.replace(tmp, INDEX_PATH)
+
+    @classmethod
+    def load(cls):
+        index = cls()
+        try:
+            with open(INDEX_PATH) as f:
+                saved = json.load(f)
+        except (OSError, ValueError):
+            return index
+        for doc in saved["docs"]:
+            index._add(doc)
+        return index
+
+    def expand(self, token):
+        # Exact term, then prefix matches, then terms one edit away. Returns
+        # (term, weight) pairs; looser matches count for less.
+        matches = {}
+        if token in self.postings:
+            matches[token] = 1.0
+        start = bisect.bisect_left(self.vocabulary, token)
+        for term in self.vocabulary[start:start + 50]:
+            if not term.startswith(token):
+                break
+            matches.setdefault(term, 0.7)
+        if not matches and len(token) > 3:
+            candidates = set(self.deletes.get(token, ()))
+            for variant in _deletes(token) | {token}:
+                candidates |= self.deletes.get(variant, set())
+                if variant in self.postings:
+                    candidates.add(variant)
+            for term in candidates:
+                matches.setdefault(term, 0.5)
+        return matches.items()
+
+    def search(self, query, limit=MAX_RESULTS):
+        tokens = tokenize(query)
+        with self._lock:
+            return self._search(tokens, limit) if tokens and self.docs else []
+
+    def _search(self, tokens, limit):
+        n = len(self.docs)
+        average = self.total_length / n
+        scores = {}
+        for token in tokens:
+            for term, weight in self.expand(token):
+                postings = self.postings[term]
+                idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length = self.docs[doc_id]["length"]
+                    score = idf * tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average))
+                    scores[doc_id] = scores.get(doc_id, 0) + weight * score
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [{**self.docs[doc_id], "score": score} for doc_id, score in ranked]
+
+
+@st.cache_resource(show_spinner=False)
+def get_index():
+    return Index.load()
+
+
+def snippet(text, query, width=140):
+    tokens = tokenize(query)
+    lower = text.lower()
+    positions = [lower.find(t) for t in tokens if lower.find(t) >= 0]
+    start = max(0, min(positions) - width // 3) if positions else 0
+    excerpt = text[start:start + width]
+    return ("…" if start else "") + excerpt + ("…" if start + width < len(text) else "")
+
+
+def sidebar(pages):
+    # `pages` maps content page name -> (sidebar label, relative URL).
+    query = st.sidebar.text_input("Search the docs", placeholder="e.g. nullifier, Polygon, soundbox")
+    if not query.strip():
+        return
+
+    index = get_index()
+    index.refresh(pages)
+    results = index.search(query)
+    if not results:
+        st.sidebar.caption("No matches.")
+        return
+    for result in results:
+        href = f"./{result['url']}" + (f"#{result['anchor']}" if result["anchor"] else "")
+        st.sidebar.markdown(
+            f"**[{result['page']} › {result['heading']}]({href})**  \n{snippet(result['text'], query)}"
+        )
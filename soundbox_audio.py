@@ -0,0 +1,245 @@
+import hashlib
+import io
+import os
+import re
+import shutil
+import struct
+import subprocess
+import threading
+import time
+import wave
+
+import numpy as np
+import streamlit as st
+
+import assets
+import content
+import soundbox_live
+
+# Wideband speech: a third smaller than espeak's 22.05 kHz and still clear.
+# Every source is resampled to it once, when its segment is rendered.
+SAMPLE_RATE = 16_000
+# Pre-rendered clips, one WAV per segment named after its text ("polygon.wav").
+SEGMENT_DIR = os.environ.get("NEXTPAY_SOUNDBOX_SEGMENTS", os.path.join("Assets", "soundbox", "segments"))
+# An offline TTS command that writes a WAV to stdout; espeak-ng or espeak
+# when installed.
+TTS_COMMAND = os.environ.get("NEXTPAY_TTS") or shutil.which("espeak-ng") or shutil.which("espeak")
+# Bound on the rendered segments kept in memory, as int16 PCM.
+CACHE_BYTES = 16 * 2**20
+# Announcer.source when there is neither a clip nor a TTS engine.
+PLACEHOLDER = "placeholder tones"
+GAP = 0.06  # seconds of silence between segments
+
+ONES = (
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen sixteen "
+    "seventeen eighteen nineteen"
+).split()
+TENS = "_ _ twenty thirty forty fifty sixty seventy eighty ninety".split()
+PHRASES = ["received", "point", "hundred", "thousand", "million", "ether", "from", "on"]
+
+
+def number_words(amount, decimals=4):
+    # 1204.05 -> ["one", "thousand", "two", "hundred", "four", "point", "zero", "five"]
+    whole, _, fraction = f"{amount:.{decimals}f}".partition(".")
+    fraction = fraction.rstrip("0")
+    words = _whole_words(int(whole))
+    if fraction:
+        words += ["point"] + [ONES[int(d)] for d in fraction]
+    return words
+
+
+def _whole_words(n):
+    if n < 20:
+        return [ONES[n]]
+    if n < 100:
+        return [TENS[n // 10]] + ([ONES[n % 10]] if n % 10 else [])
+    if n < 1000:
+        return [ONES[n // 100], "hundred"] + (_whole_words(n % 100) if n % 100 else [])
+    if n < 1_000_000:
+        return _whole_words(n // 1000) + ["thousand"] + (_whole_words(n % 1000) if n % 1000 else [])
+    return _whole_words(n // 1_000_000) + ["million"] + (_whole_words(n % 1_000_000) if n % 1_000_000 else [])
+
+
+def announcement(amount_wei, name, chain):
+    # "Received 0.25 ether from Asha on Polygon", as segment texts.
+    chain = soundbox_live.CHAINS.get(chain, chain)
+    return ["received", *number_words(amount_wei / 10**18), "ether", "from", name, "on", chain]
+
+
+def _slug(text):
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")
+
+
+def _resample(samples, rate):
+    if rate == SAMPLE_RATE or not len(samples):
+        return samples
+    count = round(len(samples) * SAMPLE_RATE / rate)
+    return np.interp(np.linspace(0, len(samples) - 1, count), np.arange(len(samples)), samples).astype(np.int16)
+
+
+def _read_wav(source):
+    with wave.open(source) as f:
+        if f.getsampwidth() != 2:
+            raise ValueError("only 16-bit PCM WAVs are supported")
+        frames = f.readframes(f.getnframes())
+        channels, rate = f.getnchannels(), f.getframerate()
+    samples = np.frombuffer(frames[: len(frames) // (2 * channels) * 2 * channels], "<i2")
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1).astype(np.int16)
+    return _resample(samples, rate)
+
+
+def _tts(command, text):
+    result = subprocess.run([command, "--stdout", text], capture_output=True, timeout=30, check=True)
+    return _read_wav(io.BytesIO(result.stdout))
+
+
+def _tones(text):
+    # Stand-in when there is neither a clip nor a TTS engine: one soft blip
+    # per syllable, pitched from the text, so the timing of an announcement
+    # can still be heard and measured.
+    syllables = max(1, len(re.findall(r"[aeiouy]+", text.lower())))
+    digest = hashlib.sha256(text.encode()).digest()
+    length = int(0.11 * SAMPLE_RATE)
+    t = np.arange(length) / SAMPLE_RATE
+    envelope = np.sin(np.pi * t / t[-1]) ** 2
+    out = np.zeros(syllables * (length + int(0.02 * SAMPLE_RATE)), np.int16)
+    for i in range(syllables):
+        pitch = 220 + digest[i % len(digest)] * 1.5
+        start = i * (length + int(0.02 * SAMPLE_RATE))
+        out[start:start + length] = (np.sin(2 * np.pi * pitch * t) * envelope * 9000).astype(np.int16)
+    return out
+
+
+def wav_header(data_bytes):
+    # The 44-byte header of a mono 16-bit PCM WAV at SAMPLE_RATE.
+    fmt = struct.pack("<IHHIIHH", 16, 1, 1, SAMPLE_RATE, SAMPLE_RATE * 2, 2, 16)
+    return b"RIFF" + struct.pack("<I", 36 + data_bytes) + b"WAVEfmt " + fmt + b"data" + struct.pack("<I", data_bytes)
+
+
+class Announcer:
+    """Builds spoken transfer alerts from cached, pre-rendered segments.
+
+    Each segment (a phrase, a number word, a chain or payer name) is
+    rendered once, from a bundled clip in SEGMENT_DIR if there is one, else
+    with the offline TTS engine, else as placeholder tones. An alert is the
+    cached segments copied back to back into one preallocated WAV buffer.
+    """
+
+    def __init__(self, segment_dir=SEGMENT_DIR, tts=TTS_COMMAND, cache=None):
+        self.segment_dir = segment_dir
+        self.tts = tts
+        self.cache = cache or assets.ByteCache(CACHE_BYTES)
+
+    @property
+    def source(self):
+        if os.path.isdir(self.segment_dir):
+            return "bundled clips"
+        return f"{os.path.basename(self.tts)} TTS" if self.tts else PLACEHOLDER
+
+    def render(self, text):
+        # One segment from its source, bypassing the cache.
+        path = os.path.join(self.segment_dir, f"{_slug(text)}.wav")
+        if os.path.exists(path):
+            return _read_wav(path)
+        if self.tts:
+            return _tts(self.tts, text)
+        return _tones(text)
+
+    def _render_shared(self, text):
+        pcm = self.render(text)
+        pcm.flags.writeable = False
+        return pcm
+
+    def segment(self, text):
+        return self.cache.get(text.lower(), self._render_shared)
+
+    def warm(self, names=soundbox_live.NAMES):
+        # Everything an alert can contain except unusual payer names.
+        for text in [*PHRASES, *ONES, *TENS[2:], *soundbox_live.CHAINS.values(), *names]:
+            self.segment(text)
+
+    def build(self, texts):
+        # WAV bytes for the segments in order. The output is sized up front
+        # and each segment is copied straight into it from the cache.
+        segments = [self.segment(text) for text in texts]
+        gap = int(GAP * SAMPLE_RATE) * 2
+        data = sum(s.nbytes for s in segments) + gap * (len(segments) - 1)
+        out = bytearray(44 + data)  # zero-filled, so the gaps are silence
+        out[:44] = wav_header(data)
+        view = memoryview(out)
+        offset = 44
+        for pcm in segments:
+            view[offset:offset + pcm.nbytes] = pcm.view(np.uint8)
+            offset += pcm.nbytes + gap
+        return out
+
+    def announce(self, amount_wei, name, chain):
+        return self.build(announcement(amount_wei, name, chain))
+
+    def synthesize(self, amount_wei, name, chain):
+        # The old way, for comparison: the whole sentence rendered per alert.
+        pcm = self.render(" ".join(announcement(amount_wei, name, chain)))
+        return wav_header(pcm.nbytes) + pcm.tobytes()
+
+
+@st.cache_resource(show_spinner=False)
+def get_announcer():
+    announcer = Announcer()
+    # Warm in the background so the first visitor isn't kept waiting; any
+    # segment still missing is rendered on demand.
+    threading.Thread(target=announcer.warm, daemon=True).start()
+    return announcer
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def _clip(wei, name, chain):
+    # One WAV per set of inputs; replaying it costs nothing to build.
+    return bytes(get_announcer().announce(wei, name, chain))
+
+
+def _play(alert):
+    st.session_state["soundbox_audio_alert"] = alert
+
+
+@content.live_only
+@st.fragment
+def _player():
+    announcer = get_announcer()
+    cols = st.columns(3)
+    amount = cols[0].number_input(
+        "Amount (ETH)", min_value=0.0001, value=0.25, step=0.05, format="%.4f", key="soundbox_audio_amount"
+    )
+    name = cols[1].selectbox("From", soundbox_live.NAMES, key="soundbox_audio_name")
+    chain = cols[2].selectbox(
+        "Chain", list(soundbox_live.CHAINS), format_func=soundbox_live.CHAINS.get, key="soundbox_audio_chain"
+    )
+
+    if announcer.source == PLACEHOLDER:
+        st.info(
+            "This server has no recorded clips and no text-to-speech engine, so the example plays "
+            "placeholder tones: one blip per syllable, timed like the spoken alert."
+        )
+
+    # The clip is only built and sent once the reader asks for it, and only
+    # for the inputs it was asked for.
+    alert = (round(amount * 10**18), name, chain)
+    st.button("▶️ Play example", on_click=_play, args=(alert,), key="soundbox_audio_play")
+    if st.session_state.get("soundbox_audio_alert") != alert:
+        return
+    start = time.perf_counter()
+    clip = _clip(*alert)
+    elapsed = time.perf_counter() - start
+    st.audio(clip, format="audio/wav", autoplay=True)
+    sentence = " ".join(announcement(*alert))
+    st.caption(f"“{sentence[0].upper()}{sentence[1:]}”, ready in {elapsed * 1000:.1f} ms from {announcer.source}.")
+
+
+def panel():
+    st.subheader("🔈 Hear an Alert", anchor="hear-an-alert")
+    st.write(
+        "Soundbox alerts are stitched together from short segments: the phrases, number words, payer "
+        "names and chain names. Each one is rendered once, from a recorded clip or an offline "
+        "text-to-speech engine, and kept in memory, so nothing is synthesised per transfer."
+    )
+    _player()
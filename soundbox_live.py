@@ -0,0 +1,284 @@
+import asyncio
+import hashlib
+import os
+import random
+import threading
+import time
+from collections import deque, namedtuple
+
+import streamlit as st
+
+import content
+
+CHAINS = {
+    "ETH": "Ethereum",
+    "BSC": "Binance Smart Chain",
+    "PLG": "Polygon",
+    "AVAX": "Avalanche",
+}
+# Events per second each simulated chain emits; override with
+# NEXTPAY_SIM_RATES="ETH=200,BSC=50".
+DEFAULT_RATES = {"ETH": 40, "BSC": 25, "PLG": 60, "AVAX": 15}
+TICK = 0.1
+DEMO_ADDRESSES = ["0x" + hashlib.sha256(f"nextpay-demo-{i}".encode()).hexdigest()[:40] for i in range(16)]
+NAMES = ["Asha", "Ravi", "Chai Stall", "Kirana Store", "Meera", "Arjun", "Book Depot", "Priya"]
+# Events a subscriber can fall behind by before the oldest are dropped.
+BUFFER_SIZE = 500
+# Subscriptions nobody has polled for this long are removed.
+IDLE_TIMEOUT = 30
+UI_INTERVAL = 1.0
+
+# Mirrors TransferTokens.Transfer(_from, _to, _amount, _name, _blockchain).
+Transfer = namedtuple("Transfer", "sender recipient amount name blockchain block timestamp")
+
+
+def parse_rates(value):
+    rates = dict(DEFAULT_RATES)
+    for item in filter(None, (value or "").split(",")):
+        chain, _, rate = item.partition("=")
+        rates[chain.strip().upper()] = float(rate)
+    return {chain: rate for chain, rate in rates.items() if chain in CHAINS and rate > 0}
+
+
+class Subscription:
+    # A bounded per-session inbox. The hub pushes batches; the session drains
+    # them once per UI refresh. When the session falls behind, the oldest
+    # events are dropped instead of blocking the hub.
+    def __init__(self, chains, recipient):
+        self.chains = frozenset(chains)
+        self.recipient = recipient.lower() if recipient else None
+        self.delivered = 0
+        self.dropped = 0
+        # Set by Hub.unsubscribe, e.g. when the idle reaper removes it.
+        self.closed = False
+        self.last_poll = time.monotonic()
+        self._queue = deque(maxlen=BUFFER_SIZE)
+        self._lock = threading.Lock()
+
+    def push(self, events):
+        with self._lock:
+            overflow = len(self._queue) + len(events) - BUFFER_SIZE
+            if overflow > 0:
+                self.dropped += overflow
+            self._queue.extend(events)
+
+    def drain(self):
+        # Only events that survived the buffer count as delivered.
+        with self._lock:
+            self.last_poll = time.monotonic()
+            events = list(self._queue)
+            self._queue.clear()
+            self.delivered += len(events)
+        return events
+
+
+class Hub:
+    def __init__(self, rates):
+        self.rates = rates
+        # Indexed subscription table: an event is only offered to the
+        # subscribers of its (chain, recipient) pair and of its chain's
+        # "any recipient" bucket, never to every listener.
+        self._by_recipient = {}
+        self._by_chain = {}
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.fanout = 0
+        self._samples = deque(maxlen=10)
+        # Set while anyone is subscribed; the simulators idle otherwise.
+        self._listening = asyncio.Event()
+        self.loop = asyncio.new_event_loop()
+        threading.Thread(target=self._run, name="soundbox-hub", daemon=True).start()
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        for chain, rate in self.rates.items():
+            self.loop.create_task(self._simulate(chain, rate))
+        self.loop.create_task(self._housekeeping())
+        self.loop.run_forever()
+
+    async def _simulate(self, chain, rate):
+        rng = random.Random(chain)
+        block = rng.randint(1_000_000, 20_000_000)
+        while True:
+            await self._listening.wait()
+            await asyncio.sleep(TICK)
+            block += 1
+            # Exponential gaps give a Poisson number of events per tick.
+            events = []
+            elapsed = rng.expovariate(rate)
+            now = time.time()
+            while elapsed < TICK:
+                events.append(Transfer(
+                    rng.choice(DEMO_ADDRESSES),
+                    rng.choice(DEMO_ADDRESSES),
+                    rng.randint(10**15, 5 * 10**18),
+                    rng.choice(NAMES),
+                    chain,
+                    block,
+                    now,
+                ))
+                elapsed += rng.expovariate(rate)
+            if events:
+                self.publish(chain, events)
+
+    def publish(self, chain, events):
+        batches = {}
+        with self._lock:
+            self.emitted += len(events)
+            everyone = self._by_chain.get(chain, ())
+            for event in events:
+                for sub in self._by_recipient.get((chain, event.recipient), ()):
+                    batches.setdefault(sub, []).append(event)
+                for sub in everyone:
+                    batches.setdefault(sub, []).append(event)
+        for sub, batch in batches.items():
+            sub.push(batch)
+            self.fanout += len(batch)
+
+    def subscribe(self, chains, recipient=None):
+        sub = Subscription(chains, recipient)
+        with self._lock:
+            for chain in sub.chains:
+                if sub.recipient:
+                    self._by_recipient.setdefault((chain, sub.recipient), set()).add(sub)
+                else:
+                    self._by_chain.setdefault(chain, set()).add(sub)
+        self.loop.call_soon_threadsafe(self._update_listening)
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.closed = True
+        with self._lock:
+            for chain in sub.chains:
+                table, key = (self._by_recipient, (chain, sub.recipient)) if sub.recipient else (self._by_chain, chain)
+                subs = table.get(key)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del table[key]
+        self.loop.call_soon_threadsafe(self._update_listening)
+
+    def _update_listening(self):
+        # Runs on the hub loop, so set/clear never race with the simulators.
+        with self._lock:
+            listening = bool(self._by_recipient or self._by_chain)
+        if listening:
+            self._listening.set()
+        else:
+            self._listening.clear()
+
+    def subscriptions(self):
+        with self._lock:
+            return {s for subs in self._by_recipient.values() for s in subs} | {
+                s for subs in self._by_chain.values() for s in subs
+            }
+
+    async def _housekeeping(self):
+        while True:
+            await asyncio.sleep(1)
+            self._samples.append((time.monotonic(), self.emitted, self.fanout))
+            cutoff = time.monotonic() - IDLE_TIMEOUT
+            for sub in self.subscriptions():
+                if sub.last_poll < cutoff:
+                    self.unsubscribe(sub)
+
+    def rates_per_second(self):
+        # (emitted, delivered) events per second over the last few seconds.
+        if len(self._samples) < 2:
+            return 0.0, 0.0
+        (t0, e0, f0), (t1, e1, f1) = self._samples[0], self._samples[-1]
+        return (e1 - e0) / (t1 - t0), (f1 - f0) / (t1 - t0)
+
+
+@st.cache_resource(show_spinner=False)
+def get_hub():
+    return Hub(parse_rates(os.environ.get("NEXTPAY_SIM_RATES")))
+
+
+def _short(address):
+    return address[:6] + "…" + address[-4:]
+
+
+def _subscription(hub, chains, recipient):
+    # One subscription per session, replaced when the filters change or after
+    # the hub reaped it for being idle.
+    key = (tuple(sorted(chains)), recipient)
+    current = st.session_state.get("soundbox_subscription")
+    if current and current[0] == key and not current[1].closed:
+        return current[1]
+    if current:
+        hub.unsubscribe(current[1])
+    sub = hub.subscribe(chains, recipient)
+    st.session_state["soundbox_subscription"] = (key, sub)
+    st.session_state["soundbox_recent"] = deque(maxlen=15)
+    st.session_state["soundbox_rate"] = (time.monotonic(), 0)
+    return sub
+
+
+@content.live_only
+@st.fragment(run_every=UI_INTERVAL)
+def _feed():
+    state = st.session_state.get("soundbox_subscription")
+    if state is None:
+        return
+    sub = state[1]
+    # One UI update per interval, however many events arrived in it.
+    batch = sub.drain()
+    recent = st.session_state["soundbox_recent"]
+    recent.extend(batch)
+
+    then, delivered_then = st.session_state["soundbox_rate"]
+    now = time.monotonic()
+    session_rate = (sub.delivered - delivered_then) / max(now - then, 1e-6)
+    st.session_state["soundbox_rate"] = (now, sub.delivered)
+    emitted_rate, fanout_rate = get_hub().rates_per_second()
+
+    cols = st.columns(4)
+    cols[0].metric("To you", f"{session_rate:,.0f}/s")
+    cols[1].metric("Hub emitted", f"{emitted_rate:,.0f}/s")
+    cols[2].metric("Hub delivered", f"{fanout_rate:,.0f}/s")
+    cols[3].metric("Dropped", f"{sub.dropped:,}")
+
+    if recent:
+        st.dataframe(
+            [
+                {
+                    "chain": CHAINS[e.blockchain],
+                    "block": e.block,
+                    "from": _short(e.sender),
+                    "to": _short(e.recipient),
+                    "amount (ETH)": f"{e.amount / 10**18:.4f}",
+                    "name": e.name,
+                }
+                for e in reversed(recent)
+            ],
+            hide_index=True,
+        )
+    else:
+        st.caption("Waiting for transfers…")
+
+
+def panel():
+    st.subheader("🎧 Live Demo", anchor="live-demo")
+    st.write(
+        "Watch simulated `Transfer` events from four chains arrive the way Soundbox "
+        "listeners see them. Pick the chains and the recipient to monitor."
+    )
+    if not st.toggle("Start the live event stream", key="soundbox_live"):
+        current = st.session_state.pop("soundbox_subscription", None)
+        if current:
+            get_hub().unsubscribe(current[1])
+        return
+
+    hub = get_hub()
+    chains = st.multiselect(
+        "Chains", list(hub.rates), default=list(hub.rates)[:1], format_func=CHAINS.get, key="soundbox_chains"
+    )
+    recipient = st.selectbox(
+        "Recipient", ["Any address"] + DEMO_ADDRESSES, key="soundbox_recipient"
+    )
+    if not chains:
+        st.caption("Select at least one chain.")
+        return
+    _subscription(hub, chains, None if recipient == "Any address" else recipient)
+    _feed()
@@ -0,0 +1,156 @@
+import argparse
+import gzip
+import mimetypes
+import os
+import shutil
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import assets
+
+STATIC_DIR = os.environ.get("NEXTPAY_STATIC_DIR", ".static")
+STATIC_PORT = os.environ.get("NEXTPAY_STATIC_PORT")
+# Files are content-addressed, so they can be cached forever.
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Image formats the server may substitute for a requested JPEG, best first.
+IMAGE_ALTERNATIVES = (("image/avif", ".avif"), ("image/webp", ".webp"))
+# Only keep a precompressed copy if it saves at least this fraction.
+MIN_SAVING = 0.1
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("image/avif", ".avif")
+
+_server = None
+_lock = threading.Lock()
+
+
+def _precompress(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    encoders = [(".gz", lambda d: gzip.compress(d, 9, mtime=0))]
+    if brotli is not None:
+        encoders.append((".br", lambda d: brotli.compress(d, quality=11)))
+    for suffix, encode in encoders:
+        target = path + suffix
+        if os.path.exists(target):
+            continue
+        compressed = encode(data)
+        if len(compressed) <= len(data) * (1 - MIN_SAVING):
+            with open(target, "wb") as f:
+                f.write(compressed)
+
+
+def publish():
+    # Copy every image variant into STATIC_DIR under its content-hashed name,
+    # plus precompressed copies where compression actually helps.
+    os.makedirs(STATIC_DIR, exist_ok=True)
+    for entry in assets.get_manifest().values():
+        for widths in entry["variants"].values():
+            for file in widths.values():
+                target = os.path.join(STATIC_DIR, file)
+                if not os.path.exists(target):
+                    shutil.copyfile(os.path.join(assets.CACHE_DIR, file), target)
+                    _precompress(target)
+
+
+class Handler(BaseHTTPRequestHandler):
+    def _resolve(self):
+        name = os.path.basename(self.path.split("?", 1)[0])
+        path = os.path.join(STATIC_DIR, name)
+        if not name or name.startswith(".") or not os.path.isfile(path):
+            return None, None, None
+
+        content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+        accept = self.headers.get("Accept", "")
+        if content_type == "image/jpeg":
+            stem = os.path.splitext(path)[0]
+            for mime, ext in IMAGE_ALTERNATIVES:
+                if mime in accept and os.path.isfile(stem + ext):
+                    return stem + ext, mime, None
+
+        accept_encoding = self.headers.get("Accept-Encoding", "")
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if encoding in accept_encoding and os.path.isfile(path + suffix):
+                return path + suffix, content_type, encoding
+        return path, content_type, None
+
+    def _respond(self, send_body):
+        path, content_type, encoding = self._resolve()
+        if path is None:
+            self.send_error(404)
+            return
+
+        # File names already carry the content hash, so the ETag only has to
+        # tell the negotiated representations apart.
+        etag = '"' + os.path.basename(path) + '"'
+        headers = {
+            "Cache-Control": CACHE_CONTROL,
+            "ETag": etag,
+            "Vary": "Accept, Accept-Encoding",
+            "Access-Control-Allow-Origin": "*",
+        }
+        if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+            self.send_response(304)
+            for key, value in headers.items():
+                self.send_header(key, value)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(os.path.getsize(path)))
+        self.end_headers()
+        if send_body:
+            with open(path, "rb") as f:
+                shutil.copyfileobj(f, self.wfile)
+
+    def do_GET(self):
+        self._respond(send_body=True)
+
+    def do_HEAD(self):
+        self._respond(send_body=False)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port, host="0.0.0.0"):
+    publish()
+    server = ThreadingHTTPServer((host, int(port)), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def start():
+    # Runs the static server inside the Streamlit process, once.
+    global _server
+    with _lock:
+        if _server is not None or not STATIC_PORT:
+            return
+        _server = serve(STATIC_PORT)
+    threading.Thread(target=_server.serve_forever, daemon=True).start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the docs images with long-lived cache headers.")
+    parser.add_argument("--port", type=int, default=int(STATIC_PORT or 8502))
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--publish-only", action="store_true", help=f"just fill {STATIC_DIR} (e.g. for nginx or a CDN)")
+    args = parser.parse_args()
+    if args.publish_only:
+        publish()
+        return
+    serve(args.port, args.host).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
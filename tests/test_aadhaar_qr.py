@@ -0,0 +1,106 @@
+import datetime
+import zlib
+
+import pytest
+
+import aadhaar_qr
+
+ON = datetime.date(2026, 1, 1)
+
+
+def signed_payload(**overrides):
+    fields = dict(aadhaar_qr.sample_fields("Asha Verma", "14-02-1995"), **overrides)
+    return aadhaar_qr.make_payload(fields, b"photo")
+
+
+def raw_payload(data):
+    # Compressed but unsigned content, as a forger without the key would send.
+    return aadhaar_qr._bytes_to_decimal(zlib.compress(data, 9))
+
+
+def test_valid_payload():
+    result = aadhaar_qr.verify(signed_payload(), on=ON)
+    assert result.signature_valid and result.hash_matches
+    assert result.age_above_18 is True
+    assert result.fields["name"] == "Asha Verma"
+    assert result.error is None
+
+
+def test_minor():
+    result = aadhaar_qr.verify(signed_payload(dob="09-11-2010"), on=ON)
+    assert result.signature_valid
+    assert result.age_above_18 is False
+
+
+def test_tampered_payload():
+    payload = aadhaar_qr.tamper(signed_payload(), "14-02-1995", "14-02-1985")
+    result = aadhaar_qr.verify(payload, on=ON)
+    assert not result.signature_valid
+    assert result.age_above_18 is None
+    assert result.error == "signature does not match"
+
+
+@pytest.mark.parametrize("payload", ["", "not digits", "12345", "9" * 300])
+def test_not_a_payload(payload):
+    with pytest.raises(aadhaar_qr.QRError):
+        aadhaar_qr.parse(payload)
+    assert aadhaar_qr.verify(payload).error
+
+
+def test_too_many_digits():
+    with pytest.raises(aadhaar_qr.QRError, match="longer than a QR code"):
+        aadhaar_qr.parse("1" * (aadhaar_qr.MAX_DIGITS + 1))
+
+
+def test_decompression_bomb():
+    payload = raw_payload(b"\0" * (aadhaar_qr.MAX_PAYLOAD_BYTES * 4))
+    assert len(payload) <= aadhaar_qr.MAX_DIGITS
+    with pytest.raises(aadhaar_qr.QRError, match="inflates past"):
+        aadhaar_qr.parse(payload)
+
+
+def test_too_short():
+    with pytest.raises(aadhaar_qr.QRError, match="too short"):
+        aadhaar_qr.parse(raw_payload(b"V2"))
+
+
+def test_wrong_version():
+    data = bytes([aadhaar_qr.DELIMITER]).join([b"V1"] + [b""] * len(aadhaar_qr.FIELDS))
+    with pytest.raises(aadhaar_qr.QRError, match="v2"):
+        aadhaar_qr.parse(raw_payload(data + bytes(aadhaar_qr.SIGNATURE_SIZE)))
+
+
+def test_malformed_email_mobile_status():
+    payload = signed_payload(email_mobile_status="x")
+    with pytest.raises(aadhaar_qr.QRError, match="email/mobile status"):
+        aadhaar_qr.parse(payload)
+    result = aadhaar_qr.verify(payload, on=ON)
+    assert not result.signature_valid
+    assert "email/mobile status" in result.error
+
+
+@pytest.mark.parametrize("dob", ["", "1995", "31-02-1995", "14/02/1995", "aa-bb-cccc"])
+def test_malformed_dob(dob):
+    with pytest.raises(aadhaar_qr.QRError, match="date of birth"):
+        aadhaar_qr.age_above_18(dob, ON)
+    # Signed by the issuer but unreadable: the signature stands, the age is unknown.
+    result = aadhaar_qr.verify(signed_payload(dob=dob), on=ON)
+    assert result.signature_valid
+    assert result.age_above_18 is None
+    assert "date of birth" in result.error
+
+
+def test_age_boundary():
+    assert aadhaar_qr.age_above_18("01-01-2008", ON)
+    assert not aadhaar_qr.age_above_18("02-01-2008", ON)
+
+
+def test_batch_limits():
+    with pytest.raises(ValueError, match="per batch"):
+        aadhaar_qr.verify_batch([""] * (aadhaar_qr.MAX_BATCH + 1), pool=None, workers=1)
+
+
+def test_public_key_round_trip():
+    key = aadhaar_qr.test_key()
+    assert key.n.bit_length() == aadhaar_qr.KEY_BITS
+    assert aadhaar_qr.load_public_key(aadhaar_qr.public_key_pem(key)) == (key.n, key.e)
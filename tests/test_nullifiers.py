@@ -0,0 +1,78 @@
+import os
+
+import numpy as np
+
+import nullifiers
+
+
+def test_lookups():
+    records = nullifiers.random_records(1000)
+    registry = nullifiers.NullifierRegistry.bulk_load(np.concatenate([records, records[:10]]))
+    assert len(registry) == 1000
+    assert registry.contains(records[5].tobytes())
+    assert not registry.contains(nullifiers.random_records(1, seed=1)[0].tobytes())
+    assert registry.contains_many(records).all()
+
+
+def test_add_and_compact():
+    registry = nullifiers.NullifierRegistry.bulk_load(nullifiers.random_records(100))
+    key = "0x" + "ab" * 32
+    assert registry.add(key)
+    assert not registry.add(key)
+    assert registry.explain(key) == (True, "pending")
+    registry.compact()
+    assert registry.explain(key) == (True, "index")
+    assert len(registry) == 101
+
+
+def test_empty_registry():
+    registry = nullifiers.NullifierRegistry.bulk_load(nullifiers.random_records(0))
+    assert len(registry) == 0
+    assert not registry.contains(b"\1" * 32)
+    assert registry.add(b"\1" * 32)
+    assert registry.contains(b"\1" * 32)
+
+
+def test_reopen_replays_log(tmp_path):
+    registry = nullifiers.NullifierRegistry.bulk_load(nullifiers.random_records(100), path=tmp_path)
+    fresh = nullifiers.random_records(3, seed=1)
+    for record in fresh:
+        registry.add(record.tobytes())
+    # A torn write from a crash mid-append.
+    registry._log.write(b"\7" * 10)
+    registry._log.flush()
+
+    reopened = nullifiers.NullifierRegistry.open(tmp_path)
+    assert len(reopened) == 103
+    assert len(reopened.pending) == 3
+    assert reopened.contains_many(fresh).all()
+
+
+def test_crash_before_log_truncation(tmp_path):
+    registry = nullifiers.NullifierRegistry.bulk_load(nullifiers.random_records(100), path=tmp_path)
+    fresh = nullifiers.random_records(5, seed=1)
+    for record in fresh:
+        registry.add(record.tobytes())
+    log = os.path.join(tmp_path, "pending.bin")
+    with open(log, "rb") as f:
+        logged = f.read()
+    registry.compact()
+    # As if the process died after committing the compaction but before it
+    # truncated the log.
+    with open(log, "wb") as f:
+        f.write(logged)
+
+    reopened = nullifiers.NullifierRegistry.open(tmp_path)
+    assert len(reopened) == 105
+    assert not reopened.pending
+    reopened.compact()
+    assert len(reopened.records) == 105
+
+
+def test_save_keeps_one_generation(tmp_path):
+    registry = nullifiers.NullifierRegistry.bulk_load(nullifiers.random_records(100), path=tmp_path)
+    registry.add(b"\1" * 32)
+    registry.compact()
+    arrays = sorted(f for f in os.listdir(tmp_path) if f.endswith(".npy"))
+    assert arrays == ["bloom.2.npy", "prefixes.2.npy", "records.2.npy"]
+    assert len(nullifiers.NullifierRegistry.open(tmp_path)) == 101
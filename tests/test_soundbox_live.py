@@ -0,0 +1,26 @@
+import time
+
+import soundbox_live
+
+
+def test_overflow_is_not_delivered():
+    sub = soundbox_live.Subscription(["ETH"], None)
+    sub.push([None] * (soundbox_live.BUFFER_SIZE + 20))
+    assert len(sub.drain()) == soundbox_live.BUFFER_SIZE
+    assert sub.delivered == soundbox_live.BUFFER_SIZE
+    assert sub.dropped == 20
+
+
+def test_simulators_idle_without_subscribers():
+    hub = soundbox_live.Hub({"ETH": 500})
+    time.sleep(0.3)
+    assert hub.emitted == 0
+    sub = hub.subscribe(["ETH"])
+    time.sleep(0.5)
+    assert hub.emitted > 0
+    hub.unsubscribe(sub)
+    assert sub.closed
+    time.sleep(0.2)
+    emitted = hub.emitted
+    time.sleep(0.3)
+    assert hub.emitted == emitted
@@ -0,0 +1,38 @@
+import pytest
+
+import transfer_abi
+
+SENDER = "0x" + "11" * 20
+RECIPIENT = "0x" + "22" * 20
+
+
+def log(amount=10**18, name="Asha"):
+    topics, data = transfer_abi.encode_log(SENDER, RECIPIENT, amount, name, "Polygon")
+    return {"topics": topics, "data": data}
+
+
+def test_round_trip():
+    logs = [log(), log(2**200, "Chai Stall"), log(0, "")]
+    transfers = transfer_abi.decode_logs(logs)
+    assert transfers == [transfer_abi.decode_log(entry["topics"], entry["data"]) for entry in logs]
+    assert transfers[1] == transfer_abi.Transfer(SENDER, RECIPIENT, 2**200, "Chai Stall", "Polygon")
+
+
+@pytest.mark.parametrize("malformed", [
+    lambda entry: {**entry, "topics": entry["topics"][:2] + [entry["topics"][2][:-1]]},
+    lambda entry: {**entry, "topics": entry["topics"][:2]},
+    lambda entry: {**entry, "topics": [t[2:] + "00" for t in entry["topics"]]},
+    lambda entry: {**entry, "data": entry["data"][:-1]},
+    lambda entry: {**entry, "data": entry["data"][2:] + "00"},
+    lambda entry: {**entry, "data": entry["data"][:-2] + "zz"},
+    lambda entry: {**entry, "data": None},
+])
+def test_malformed_log_only_fails_itself(malformed):
+    logs = [log(), malformed(log(name="Ravi")), log(name="Meera")]
+    transfers = transfer_abi.decode_logs(logs)
+    assert transfers[1] is None
+    assert [t.name for t in (transfers[0], transfers[2])] == ["Asha", "Meera"]
+
+
+def test_empty_batch():
+    assert transfer_abi.decode_logs([]) == []
@@ -0,0 +1,65 @@
+import urllib.error
+
+import pytest
+
+import transfer_history
+import transfer_indexer
+
+
+class FlakyClient:
+    # Fails the first `failures` calls with `error`, then serves an empty
+    # chain whose head is at block 100.
+    def __init__(self, error, failures):
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def call(self, method, *params):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return hex(100) if method == "eth_blockNumber" else []
+
+    def batch(self, method, param_lists):
+        return []
+
+
+def indexer(tmp_path, client):
+    chain = transfer_indexer.ChainIndexer("ETH", {"url": "", "address": "0x0"}, str(tmp_path / "h.db"), confirmations=0)
+    chain.client = client
+    return chain
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(transfer_indexer, "RETRY_DELAY", 0)
+
+
+@pytest.mark.parametrize("error", [
+    urllib.error.URLError("connection refused"),
+    TimeoutError("timed out"),
+    urllib.error.HTTPError("", 503, "Service Unavailable", {}, None),
+    transfer_indexer.RpcError(-32603, "internal error"),
+])
+def test_transient_errors_are_retried(tmp_path, error):
+    chain = indexer(tmp_path, FlakyClient(error, 2))
+    chain.run()
+    assert chain.retries == 2
+    conn = transfer_history.connect(chain.db_path)
+    assert transfer_history.checkpoint(conn, "ETH") == 100
+    conn.close()
+
+
+def test_fatal_errors_are_raised(tmp_path):
+    error = urllib.error.HTTPError("", 401, "Unauthorized", {}, None)
+    chain = indexer(tmp_path, FlakyClient(error, 1))
+    with pytest.raises(urllib.error.HTTPError):
+        chain.run()
+    assert chain.retries == 0
+
+
+def test_one_off_run_gives_up(tmp_path):
+    chain = indexer(tmp_path, FlakyClient(TimeoutError("timed out"), 100))
+    with pytest.raises(TimeoutError):
+        chain.run()
+    assert chain.retries == transfer_indexer.RETRIES - 1
@@ -0,0 +1,265 @@
+# ABI helpers for TransferTokens.Transfer(address indexed _from,
+# address indexed _to, uint256 _amount, string _name, string _blockchain).
+from collections import namedtuple
+from itertools import chain
+
+import numpy as np
+
+# keccak256("Transfer(address,address,uint256,string,string)")
+TRANSFER_TOPIC = "0x5958983c36c78f71aaec2c8d1eb5f392fd57316d842a6aa664705e3e198b7253"
+TRANSFER_TOPIC_BYTES = bytes.fromhex(TRANSFER_TOPIC[2:])
+
+Transfer = namedtuple("Transfer", "sender recipient amount name blockchain")
+
+
+class DecodeError(ValueError):
+    pass
+
+
+def _word(data, offset):
+    if offset + 32 > len(data):
+        raise DecodeError(f"data too short for word at {offset}")
+    return int.from_bytes(data[offset:offset + 32], "big")
+
+
+def _string(data, offset):
+    length = _word(data, offset)
+    start = offset + 32
+    if start + length > len(data):
+        raise DecodeError(f"string at {offset} runs past the data")
+    return bytes(data[start:start + length]).decode("utf-8", errors="replace")
+
+
+def topic_address(topic):
+    return "0x" + topic[-40:].lower()
+
+
+def decode_raw(topics, data):
+    # `topics` as 32-byte strings, `data` as bytes or a memoryview.
+    if len(topics) != 3 or topics[0] != TRANSFER_TOPIC_BYTES:
+        raise DecodeError("not a TransferTokens.Transfer log")
+    return Transfer(
+        "0x" + topics[1][12:].hex(),
+        "0x" + topics[2][12:].hex(),
+        _word(data, 0),
+        _string(data, _word(data, 32)),
+        _string(data, _word(data, 64)),
+    )
+
+
+def decode_log(topics, data):
+    # `topics` and `data` as returned by eth_getLogs (0x-prefixed hex).
+    return decode_raw([bytes.fromhex(t[2:]) for t in topics], bytes.fromhex(data[2:]))
+
+
+def _encode_string(value):
+    raw = value.encode("utf-8")
+    padded = raw + b"\0" * (-len(raw) % 32)
+    return len(raw).to_bytes(32, "big") + padded
+
+
+def encode_log(sender, recipient, amount, name, blockchain):
+    # The inverse of decode_log; used by the fake RPC server and benchmarks.
+    name_part = _encode_string(name)
+    head = (
+        amount.to_bytes(32, "big")
+        + (96).to_bytes(32, "big")
+        + (96 + len(name_part)).to_bytes(32, "big")
+    )
+    topics = [TRANSFER_TOPIC] + ["0x" + "0" * 24 + a[2:].lower() for a in (sender, recipient)]
+    return topics, "0x" + (head + name_part + _encode_string(blockchain)).hex()
+
+
+class Batch:
+    # Columnar decode of n logs: addresses and amounts as NumPy columns,
+    # strings as [start, end) offsets into the data buffer, which is only
+    # sliced (through a memoryview) when the strings are asked for.
+    def __init__(self, n, data):
+        self.data = data
+        self.valid = np.zeros(n, bool)
+        self.senders = np.zeros((n, 20), np.uint8)
+        self.recipients = np.zeros((n, 20), np.uint8)
+        self.amount_limbs = np.zeros((n, 4), np.uint64)  # big-endian limbs
+        self.name_offsets = np.zeros((n, 2), np.int64)
+        self.blockchain_offsets = np.zeros((n, 2), np.int64)
+        self.fallback = {}  # row -> Transfer decoded by the scalar path
+
+    def __len__(self):
+        return len(self.valid)
+
+    @staticmethod
+    def _hex_addresses(array):
+        flat = array.tobytes().hex()
+        return ["0x" + flat[i:i + 40] for i in range(0, len(flat), 40)]
+
+    def amounts(self):
+        # Python ints; uint256 doesn't fit any NumPy dtype, but amounts under
+        # 2**64 wei (~18 ETH) convert straight from the low limb.
+        limbs = self.amount_limbs
+        out = limbs[:, 3].tolist()
+        for i in np.flatnonzero(limbs[:, :3].any(axis=1)).tolist():
+            a, b, c, d = limbs[i].tolist()
+            out[i] = (a << 192) | (b << 128) | (c << 64) | d
+        return out
+
+    def strings(self, offsets):
+        # Gathers every string's bytes into one buffer with a single fancy
+        # index, then decodes it in one call. When it is all ASCII, byte
+        # offsets are character offsets and the strings are plain slices.
+        sizes = offsets[:, 1] - offsets[:, 0]
+        ends = np.cumsum(sizes)
+        starts = ends - sizes
+        buf = np.frombuffer(self.data, np.uint8)
+        gathered = buf[np.repeat(offsets[:, 0] - starts, sizes) + np.arange(ends[-1] if len(ends) else 0)]
+        if gathered.size and gathered.max() >= 0x80:
+            view = memoryview(self.data)
+            return [bytes(view[a:b]).decode("utf-8", errors="replace") for a, b in offsets.tolist()]
+        text = gathered.tobytes().decode("ascii")
+        return [text[a:b] for a, b in zip(starts.tolist(), ends.tolist())]
+
+    def decoded(self):
+        # Rows that decoded on either path.
+        decoded = self.valid.copy()
+        decoded[list(self.fallback)] = True
+        return decoded
+
+    def columns(self):
+        # One list per Transfer field, with the scalar fallbacks filled in.
+        # Entries for rows that failed to decode are meaningless.
+        columns = [
+            self._hex_addresses(self.senders),
+            self._hex_addresses(self.recipients),
+            self.amounts(),
+            self.strings(self.name_offsets),
+            self.strings(self.blockchain_offsets),
+        ]
+        for i, transfer in self.fallback.items():
+            for column, value in zip(columns, transfer):
+                column[i] = value
+        return columns
+
+    def transfers(self):
+        # Row-oriented view, None for logs that failed to decode.
+        out = list(map(Transfer, *self.columns()))
+        for i in np.flatnonzero(~self.decoded()).tolist():
+            out[i] = None
+        return out
+
+
+def _words(buf, positions):
+    # Gathers the 32-byte words starting at each position into an (n, 4)
+    # array of big-endian uint64 limbs.
+    gathered = buf[positions[:, None] + np.arange(32)]
+    return gathered.view(">u8").astype(np.uint64)
+
+
+def decode_buffers(topics, data, offsets):
+    # Decodes n logs packed into contiguous buffers: `topics` holds n * 3
+    # topics of 32 bytes, `data` the concatenated payloads and `offsets` the
+    # n + 1 boundaries of each payload in it. Both buffers are read in place.
+    # Rows the vectorised path can't vouch for are retried one at a time
+    # with decode_raw(); the ones that still fail are left invalid.
+    offsets = np.asarray(offsets, np.int64)
+    n = len(offsets) - 1
+    batch = Batch(n, data)
+    if n == 0:
+        return batch
+    t = np.frombuffer(topics, np.uint8).reshape(n, 3, 32)
+    buf = np.frombuffer(data, np.uint8)
+    starts, lengths = offsets[:-1], np.diff(offsets)
+
+    ok = (t[:, 0] == np.frombuffer(TRANSFER_TOPIC_BYTES, np.uint8)).all(axis=1)
+    ok &= ~t[:, 1:, :12].any(axis=(1, 2))
+    ok &= lengths >= 96
+
+    # Every gather below reads inside the buffer; rows already known to be
+    # bad read from position 0 instead and are discarded anyway.
+    safe = np.where(ok, starts, 0)
+    head = np.stack([_words(buf, safe + k) for k in (0, 32, 64)], axis=1)  # (n, 3, 4)
+    ok &= ~head[:, 1:, :3].any(axis=(1, 2))
+
+    spans = []
+    for k in (1, 2):
+        rel = np.where(ok, head[:, k, 3], 0).astype(np.int64)
+        ok &= (rel >= 0) & (rel <= lengths - 32)
+        at = np.where(ok, safe + rel, 0)
+        length = _words(buf, at)
+        ok &= ~length[:, :3].any(axis=1) & (length[:, 3] <= lengths.astype(np.uint64))
+        size = np.where(ok, length[:, 3], 0).astype(np.int64)
+        ok &= rel + 32 + size <= lengths
+        spans.append(np.stack([at + 32, at + 32 + size], axis=1))
+
+    batch.valid = ok
+    batch.senders = np.where(ok[:, None], t[:, 1, 12:], 0).astype(np.uint8)
+    batch.recipients = np.where(ok[:, None], t[:, 2, 12:], 0).astype(np.uint8)
+    batch.amount_limbs = np.where(ok[:, None], head[:, 0], 0).astype(np.uint64)
+    batch.name_offsets = np.where(ok[:, None], spans[0], 0)
+    batch.blockchain_offsets = np.where(ok[:, None], spans[1], 0)
+
+    view = memoryview(data)
+    for i in np.flatnonzero(~ok).tolist():
+        try:
+            batch.fallback[i] = decode_raw(
+                [bytes(t[i, k]) for k in range(3)], view[offsets[i]:offsets[i + 1]]
+            )
+        except DecodeError:
+            continue
+    return batch
+
+
+def _pack_topics(logs):
+    # Every topic is "0x" plus 64 hex digits, so the joined string is a
+    # fixed-width table whose prefix column can be dropped in one slice.
+    # Hex digits never contain an "x", so if every row starts with "0x" the
+    # rows line up with the topics.
+    if any(len(log["topics"]) != 3 for log in logs):
+        raise ValueError("log without three topics")
+    joined = "".join(chain.from_iterable(log["topics"] for log in logs)).encode("ascii")
+    if len(joined) != 3 * 66 * len(logs):
+        raise ValueError("topic of the wrong length")
+    table = np.frombuffer(joined, np.uint8).reshape(-1, 66)
+    if not ((table[:, 0] == ord("0")).all() and (table[:, 1] == ord("x")).all()):
+        raise ValueError("topic without a 0x prefix")
+    return bytes.fromhex(table[:, 2:].tobytes().decode("ascii"))
+
+
+def _pack_data(logs):
+    payloads = [log["data"][2:] for log in logs]
+    if "".join(log["data"][:2] for log in logs) != "0x" * len(logs):
+        raise ValueError("data without a 0x prefix")
+    offsets = np.zeros(len(logs) + 1, np.int64)
+    np.cumsum(np.fromiter(map(len, payloads), np.int64, len(payloads)), out=offsets[1:])
+    # An odd-length payload would shift every payload after it by a nibble.
+    if (offsets & 1).any():
+        raise ValueError("odd-length data")
+    return bytes.fromhex("".join(payloads)), offsets // 2
+
+
+def _pack_log(log):
+    # One log's topics and data as bytes; a malformed log gets zero topics
+    # and no data, so decode_buffers() leaves it invalid.
+    try:
+        topics, data = log["topics"], log["data"]
+        if len(topics) != 3 or any(len(t) != 66 or t[:2] != "0x" for t in topics) or data[:2] != "0x":
+            raise ValueError("malformed log")
+        return bytes.fromhex("".join(t[2:] for t in topics)), bytes.fromhex(data[2:])
+    except (TypeError, ValueError):
+        return bytes(96), b""
+
+
+def pack_logs(logs):
+    # eth_getLogs results -> (topics, data, offsets) for decode_buffers().
+    # The whole batch is converted in bulk; if any log is malformed, it is
+    # packed again log by log so that only the bad ones come back invalid.
+    try:
+        return (_pack_topics(logs), *_pack_data(logs))
+    except (TypeError, ValueError):
+        pass
+    packed = [_pack_log(log) for log in logs]
+    offsets = np.zeros(len(logs) + 1, np.int64)
+    np.cumsum([len(data) for _, data in packed], out=offsets[1:])
+    return b"".join(t for t, _ in packed), b"".join(d for _, d in packed), offsets
+
+
+def decode_logs(logs):
+    return decode_buffers(*pack_logs(logs)).transfers()
@@ -0,0 +1,160 @@
+import os
+import sqlite3
+
+import streamlit as st
+
+import content
+import soundbox_live
+
+HISTORY_DB = os.environ.get("NEXTPAY_HISTORY_DB", "history.db")
+PAGE_SIZE = 25
+
+# WITHOUT ROWID keeps rows clustered by (chain, block, log_index), which also
+# serves as the per-chain index. Secondary indexes in such tables carry the
+# primary key, so (sender, timestamp) is really (sender, timestamp, chain,
+# block, log_index): exactly the keyset order history() pages through.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transfers (
+    chain TEXT NOT NULL,
+    block INTEGER NOT NULL,
+    log_index INTEGER NOT NULL,
+    timestamp INTEGER NOT NULL,
+    tx_hash TEXT NOT NULL,
+    sender TEXT NOT NULL,
+    recipient TEXT NOT NULL,
+    amount TEXT NOT NULL,
+    name TEXT NOT NULL,
+    blockchain TEXT NOT NULL,
+    PRIMARY KEY (chain, block, log_index)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transfers_sender ON transfers (sender, timestamp);
+CREATE INDEX IF NOT EXISTS transfers_recipient ON transfers (recipient, timestamp);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    chain TEXT PRIMARY KEY,
+    block INTEGER NOT NULL
+);
+"""
+
+COLUMNS = "timestamp, chain, block, log_index, tx_hash, sender, recipient, amount, name, blockchain"
+# Newest first. The cursor is the (timestamp, chain, block, log_index) of the
+# last row shown, so every page is an index range scan however deep it is.
+ORDER = "timestamp DESC, chain DESC, block DESC, log_index DESC"
+
+
+def connect(path=HISTORY_DB, readonly=False):
+    if readonly:
+        conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, timeout=30)
+    else:
+        conn = sqlite3.connect(path, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+    return conn
+
+
+def checkpoint(conn, chain):
+    row = conn.execute("SELECT block FROM checkpoints WHERE chain = ?", (chain,)).fetchone()
+    return row[0] if row else None
+
+
+def store(conn, chain, rows, block):
+    # Rows and the checkpoint commit together, so a restart resumes right
+    # after the last range that was fully written. Re-inserting a log that
+    # is already stored is a no-op.
+    with conn:
+        conn.executemany(f"INSERT OR IGNORE INTO transfers ({COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        conn.execute(
+            "INSERT INTO checkpoints (chain, block) VALUES (?, ?) ON CONFLICT (chain) DO UPDATE SET block = excluded.block",
+            (chain, block),
+        )
+
+
+def history(conn, address, chain=None, before=None, limit=PAGE_SIZE):
+    # Transfers sent or received by `address`, newest first. Pass the cursor
+    # of the previous page as `before` to get the next one.
+    address = address.lower()
+    filters, params = [], {"address": address, "limit": limit}
+    if chain:
+        filters.append("chain = :chain")
+        params["chain"] = chain
+    if before:
+        filters.append("(timestamp, chain, block, log_index) < (:t, :c, :b, :i)")
+        params.update(zip("tcbi", before))
+    where = "".join(f" AND {f}" for f in filters)
+    rows = conn.execute(
+        f"""
+        SELECT {COLUMNS} FROM (
+            SELECT * FROM (SELECT {COLUMNS} FROM transfers WHERE sender = :address{where} ORDER BY {ORDER} LIMIT :limit)
+            UNION
+            SELECT * FROM (SELECT {COLUMNS} FROM transfers WHERE recipient = :address{where} ORDER BY {ORDER} LIMIT :limit)
+        )
+        ORDER BY {ORDER} LIMIT :limit
+        """,
+        params,
+    ).fetchall()
+    cursor = rows[-1][:4] if len(rows) == limit else None
+    return rows, cursor
+
+
+def checkpoints(conn):
+    return dict(conn.execute("SELECT chain, block FROM checkpoints ORDER BY chain"))
+
+
+@content.live_only
+@st.fragment
+def _explorer():
+    conn = connect(HISTORY_DB, readonly=True)
+    try:
+        indexed = checkpoints(conn)
+        st.caption(" · ".join(f"{chain} indexed to block {block:,}" for chain, block in indexed.items()))
+        cols = st.columns([3, 1])
+        address = cols[0].selectbox(
+            "Address", soundbox_live.DEMO_ADDRESSES, accept_new_options=True, key="history_address"
+        )
+        chain = cols[1].selectbox("Chain", ["All"] + list(indexed), key="history_chain")
+        chain = None if chain == "All" else chain
+
+        # Cursors of the pages seen so far, so "Newer" can step back.
+        query = (address, chain)
+        if st.session_state.get("history_query") != query:
+            st.session_state["history_query"] = query
+            st.session_state["history_cursors"] = [None]
+        cursors = st.session_state["history_cursors"]
+
+        rows, cursor = history(conn, address, chain, before=cursors[-1])
+    finally:
+        conn.close()
+
+    if not rows:
+        st.caption("No transfers for this address.")
+        return
+    st.dataframe(
+        [
+            {
+                "chain": soundbox_live.CHAINS.get(row[1], row[1]),
+                "block": row[2],
+                "direction": "out" if row[5] == address.lower() else "in",
+                "counterparty": row[6] if row[5] == address.lower() else row[5],
+                "amount (ETH)": f"{int(row[7]) / 10**18:.4f}",
+                "name": row[8],
+            }
+            for row in rows
+        ],
+        hide_index=True,
+    )
+    # Callbacks run before the rerun the click triggers, so that rerun
+    # already shows the new page.
+    cols = st.columns(2)
+    cols[0].button("← Newer", disabled=len(cursors) == 1, on_click=cursors.pop, key="history_newer")
+    cols[1].button("Older →", disabled=cursor is None, on_click=cursors.append, args=(cursor,), key="history_older")
+
+
+def panel():
+    if not os.path.exists(HISTORY_DB):
+        return
+    st.subheader("📜 Transaction History", anchor="transaction-history")
+    st.write(
+        "Look up the `Transfer` events indexed from the `TransferTokens` contracts. "
+        "Pick an address to see what it sent and received, newest first."
+    )
+    _explorer()
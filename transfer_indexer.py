@@ -0,0 +1,256 @@
+import argparse
+import http.client
+import itertools
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import transfer_abi
+import transfer_history
+
+# Blocks per eth_getLogs query. The range halves whenever a provider refuses
+# a query as too large and doubles again after each success, up to MAX_CHUNK.
+DEFAULT_CHUNK = 2_000
+MAX_CHUNK = 100_000
+# Blocks behind the head that are considered final enough to index.
+CONFIRMATIONS = 12
+FOLLOW_INTERVAL = 5
+# Backoff after a transient RPC or HTTP failure: RETRY_DELAY doubling up to
+# MAX_RETRY_DELAY. A one-off run gives up after RETRIES failures in a row;
+# --follow keeps retrying.
+RETRY_DELAY = 1
+MAX_RETRY_DELAY = 60
+RETRIES = 6
+# Error codes and messages providers use for "query matched too many logs".
+TOO_MANY_CODES = {-32005}
+TOO_MANY_MESSAGES = ("more than", "too many", "limit exceeded", "response size")
+
+
+class RpcError(Exception):
+    def __init__(self, code, message):
+        super().__init__(f"{code}: {message}")
+        self.code = code
+        self.message = message
+
+    @property
+    def too_many_results(self):
+        return self.code in TOO_MANY_CODES or any(m in self.message.lower() for m in TOO_MANY_MESSAGES)
+
+
+class RpcClient:
+    def __init__(self, url, timeout=60):
+        self.url = url
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+
+    def _post(self, payload):
+        request = urllib.request.Request(
+            self.url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.load(response)
+
+    @staticmethod
+    def _result(response):
+        if "error" in response:
+            raise RpcError(response["error"].get("code"), response["error"].get("message", ""))
+        return response["result"]
+
+    def call(self, method, *params):
+        return self._result(self._post({"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}))
+
+    def batch(self, method, param_lists):
+        # One HTTP round trip for many calls of the same method.
+        if not param_lists:
+            return []
+        requests = [{"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": p} for p in param_lists]
+        by_id = {r["id"]: r for r in self._post(requests)}
+        return [self._result(by_id[r["id"]]) for r in requests]
+
+
+def transient(error):
+    # Failures worth retrying: network errors, timeouts, rate limiting, 5xx
+    # responses and RPC errors other than "too many results" (which fetch
+    # already handles by splitting the range).
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    if isinstance(error, RpcError):
+        return not error.too_many_results
+    return isinstance(error, (OSError, http.client.HTTPException, json.JSONDecodeError))
+
+
+def block_times(client, logs):
+    # Newer nodes include blockTimestamp in every log; otherwise fetch the
+    # headers of the blocks involved in one batch.
+    missing = sorted({log["blockNumber"] for log in logs if "blockTimestamp" not in log}, key=lambda b: int(b, 16))
+    headers = client.batch("eth_getBlockByNumber", [[number, False] for number in missing])
+    times = {number: int(header["timestamp"], 16) for number, header in zip(missing, headers)}
+    return {
+        log["blockNumber"]: int(log["blockTimestamp"], 16) if "blockTimestamp" in log else times[log["blockNumber"]]
+        for log in logs
+    }
+
+
+def decoded_rows(chain, logs, times):
+    # History rows for the logs that decode, built straight from the batch
+    # columns rather than through a Transfer per log.
+    batch = transfer_abi.decode_buffers(*transfer_abi.pack_logs(logs))
+    return [
+        (
+            times[log["blockNumber"]],
+            chain,
+            int(log["blockNumber"], 16),
+            int(log["logIndex"], 16),
+            log["transactionHash"],
+            sender,
+            recipient,
+            str(amount),
+            name,
+            blockchain,
+        )
+        for ok, log, sender, recipient, amount, name, blockchain in zip(
+            batch.decoded().tolist(), logs, *batch.columns()
+        )
+        if ok
+    ]
+
+
+def rows(chain, client, logs):
+    logs = [log for log in logs if not log.get("removed")]
+    return decoded_rows(chain, logs, block_times(client, logs))
+
+
+class ChainIndexer:
+    def __init__(self, chain, spec, db_path, confirmations=CONFIRMATIONS):
+        self.chain = chain
+        self.address = spec["address"]
+        self.start_block = spec.get("start_block", 0)
+        self.chunk = spec.get("chunk", DEFAULT_CHUNK)
+        self.client = RpcClient(spec["url"])
+        self.db_path = db_path
+        self.confirmations = confirmations
+        self.indexed = 0
+        self.splits = 0
+        self.retries = 0
+
+    def get_logs(self, start, end):
+        return self.client.call("eth_getLogs", {
+            "address": self.address,
+            "topics": [transfer_abi.TRANSFER_TOPIC],
+            "fromBlock": hex(start),
+            "toBlock": hex(end),
+        })
+
+    def fetch(self, start, end):
+        # Returns (logs, last block covered). Oversized ranges are split in
+        # half until the provider accepts them.
+        while True:
+            try:
+                logs = self.get_logs(start, end)
+            except RpcError as e:
+                if not e.too_many_results or start == end:
+                    raise
+                end = start + (end - start) // 2
+                self.chunk = end - start + 1
+                self.splits += 1
+                continue
+            self.chunk = min(self.chunk * 2, MAX_CHUNK)
+            return logs, end
+
+    def step(self, conn, block):
+        # Indexes the next range after `block`; returns the last block
+        # covered, or None when already at the head.
+        head = int(self.client.call("eth_blockNumber"), 16) - self.confirmations
+        if block >= head:
+            return None
+        logs, end = self.fetch(block + 1, min(block + self.chunk, head))
+        batch = rows(self.chain, self.client, logs)
+        transfer_history.store(conn, self.chain, batch, end)
+        self.indexed += len(batch)
+        return end
+
+    def run(self, follow=False, stop=None):
+        stop = stop or threading.Event()
+        conn = transfer_history.connect(self.db_path)
+        try:
+            last = transfer_history.checkpoint(conn, self.chain)
+            block = self.start_block - 1 if last is None else last
+            failures = 0
+            while not stop.is_set():
+                try:
+                    end = self.step(conn, block)
+                except Exception as e:
+                    failures += 1
+                    if not transient(e) or (not follow and failures >= RETRIES):
+                        raise
+                    delay = min(RETRY_DELAY * 2 ** (failures - 1), MAX_RETRY_DELAY)
+                    self.retries += 1
+                    print(f"{self.chain}: {e!r}, retrying in {delay}s", file=sys.stderr)
+                    stop.wait(delay)
+                    continue
+                failures = 0
+                if end is None:
+                    if not follow:
+                        return
+                    stop.wait(FOLLOW_INTERVAL)
+                else:
+                    block = end
+        finally:
+            conn.close()
+
+
+def run(config, db_path, follow=False):
+    # One worker thread per chain, each with its own SQLite connection. WAL
+    # mode lets them commit in turn while the app keeps reading.
+    transfer_history.connect(db_path).close()
+    indexers = [ChainIndexer(chain, spec, db_path) for chain, spec in config.items()]
+    errors = {}
+    # Set when a worker fails for good: the failure is reported at once and
+    # the other workers stop, rather than following forever without it.
+    stop = threading.Event()
+
+    def work(indexer):
+        try:
+            indexer.run(follow, stop)
+        except Exception as e:
+            errors[indexer.chain] = e
+            print(f"{indexer.chain}: indexing failed: {e!r}", file=sys.stderr)
+            stop.set()
+
+    threads = [threading.Thread(target=work, args=(i,), name=f"index-{i.chain}", daemon=True) for i in indexers]
+    for thread in threads:
+        thread.start()
+    while any(thread.is_alive() for thread in threads) and not stop.wait(1):
+        pass
+    return indexers, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index TransferTokens.Transfer logs into a local SQLite store.")
+    parser.add_argument("--config", required=True, help='JSON: {"ETH": {"url": ..., "address": ..., "start_block": 0}}')
+    parser.add_argument("--db", default=transfer_history.HISTORY_DB)
+    parser.add_argument("--follow", action="store_true", help="keep polling for new blocks")
+    args = parser.parse_args()
+
+    with open(args.config) as f:
+        config = json.load(f)
+    start = time.perf_counter()
+    indexers, errors = run(config, args.db, args.follow)
+    elapsed = time.perf_counter() - start
+    for indexer in indexers:
+        print(
+            f"{indexer.chain}: {indexer.indexed:,} transfers, {indexer.splits} range splits, {indexer.retries} retries"
+            + (f", failed: {errors[indexer.chain]}" if indexer.chain in errors else ""),
+            file=sys.stderr,
+        )
+    total = sum(i.indexed for i in indexers)
+    print(f"{total:,} transfers in {elapsed:.1f}s ({total / elapsed:,.0f}/s)", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
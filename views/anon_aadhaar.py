@@ -0,0 +1,9 @@
+import aadhaar_demo
+import content
+import nullifiers
+
+
+def anon_aadhaar():
+    content.render("anon_aadhaar")
+    aadhaar_demo.panel()
+    nullifiers.panel()
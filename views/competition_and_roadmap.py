@@ -0,0 +1,5 @@
+import content
+
+
+def competition_and_roadmap():
+    content.render("competition_and_roadmap")
@@ -0,0 +1,9 @@
+import content
+import fee_routes
+import transfer_history
+
+
+def cross_blockchain_payments():
+    content.render("cross_blockchain_payments")
+    fee_routes.panel()
+    transfer_history.panel()
@@ -0,0 +1,5 @@
+import content
+
+
+def faqs():
+    content.render("faqs")
@@ -0,0 +1,10 @@
+import streamlit as st
+
+import content
+
+
+def get_involved():
+    content.render("get_involved")
+
+    if st.button("Visit GitHub Repository"):
+        st.markdown('<a href="https://github.com/harshit340/NextPay" target="_blank">nextPay GitHub Repository</a>', unsafe_allow_html=True)
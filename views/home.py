@@ -0,0 +1,7 @@
+import architecture
+import content
+
+
+def home():
+    content.render("home")
+    architecture.panel()
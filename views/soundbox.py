@@ -0,0 +1,9 @@
+import content
+import soundbox_audio
+import soundbox_live
+
+
+def soundbox():
+    content.render("soundbox")
+    soundbox_audio.panel()
+    soundbox_live.panel()